@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# -------------------------
+# PART ARRAYS (SoA)
+# -------------------------
+class PartArrays:
+    """numpy views onto a World's PartStore columns, no copying.
+
+    Indices are store rows, so store.parts[i] is the Part. The views pin
+    the store's buffers: make one per frame and drop it before parts are
+    added again.
+    """
+
+    def __init__(self, store):
+        self.parts = store.parts
+        self.minx = np.frombuffer(store.minx, dtype=np.float32)
+        self.miny = np.frombuffer(store.miny, dtype=np.float32)
+        self.minz = np.frombuffer(store.minz, dtype=np.float32)
+        self.maxx = np.frombuffer(store.maxx, dtype=np.float32)
+        self.maxy = np.frombuffer(store.maxy, dtype=np.float32)
+        self.maxz = np.frombuffer(store.maxz, dtype=np.float32)
+        self.color = np.frombuffer(store.color, dtype=np.uint8).reshape(-1, 3)
+        self.collidable = np.frombuffer(store.collidable, dtype=np.uint8)
+        self.texture = np.frombuffer(store.texture, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.parts)
+
+    def in_view(self, wedge):
+        """Rows of collidable parts a culling.ViewWedge can see, as in ViewWedge.sees."""
+        ox, oy, oz = wedge.ox, wedge.oy, wedge.oz
+        mask = (
+            (self.collidable != 0) &
+            (self.miny <= oy) & (oy <= self.maxy)
+        )
+
+        # nearest point of each box within max_dist
+        dx = np.maximum(np.maximum(self.minx - ox, ox - self.maxx), 0.0)
+        dz = np.maximum(np.maximum(self.minz - oz, oz - self.maxz), 0.0)
+        mask &= dx * dx + dz * dz <= wedge.max_dist * wedge.max_dist
+
+        # box entirely outside either edge -> culled
+        for nx, nz in wedge.planes:
+            far_x = self.maxx if nx > 0.0 else self.minx
+            far_z = self.maxz if nz > 0.0 else self.minz
+            mask &= nx * (far_x - ox) + nz * (far_z - oz) >= 0.0
+        return np.flatnonzero(mask)
+
+
+# -------------------------
+# BATCH CASTER
+# -------------------------
+def cast_rays(ox, oz, angles, arrays, idx, max_dist=15.0):
+    """Slab-test every ray angle against the parts in idx at once.
+
+    Returns (dist, hit, x_face) arrays, one entry per angle. hit holds
+    indices into arrays.parts, -1 for a miss (dist is then max_dist).
+    x_face is True where the ray entered through a face facing along x.
+    """
+    n_rays = len(angles)
+    if len(idx) == 0:
+        return (np.full(n_rays, max_dist, np.float32), np.full(n_rays, -1, np.intp),
+                np.zeros(n_rays, bool))
+
+    dx = np.cos(angles).astype(np.float32)[:, None]
+    dz = np.sin(angles).astype(np.float32)[:, None]
+    # axis-parallel rays: nudge instead of dividing by zero
+    dx[dx == 0.0] = 1e-12
+    dz[dz == 0.0] = 1e-12
+    inv_x = 1.0 / dx
+    inv_z = 1.0 / dz
+
+    ax = (arrays.minx[idx] - ox)[None, :] * inv_x
+    bx = (arrays.maxx[idx] - ox)[None, :] * inv_x
+    az = (arrays.minz[idx] - oz)[None, :] * inv_z
+    bz = (arrays.maxz[idx] - oz)[None, :] * inv_z
+
+    tx0 = np.minimum(ax, bx)
+    tz0 = np.minimum(az, bz)
+    t_enter = np.maximum(tx0, tz0)
+    t_exit = np.minimum(np.maximum(ax, bx), np.maximum(az, bz))
+
+    hit = (t_enter <= t_exit) & (t_exit >= 0.0) & (t_enter <= max_dist)
+    t = np.where(hit, np.maximum(t_enter, 0.0), np.inf)
+
+    best = np.argmin(t, axis=1)
+    rows = np.arange(n_rays)
+    dist = t[rows, best]
+    x_face = tx0[rows, best] > tz0[rows, best]
+
+    missed = ~np.isfinite(dist)
+    dist[missed] = max_dist
+    hit_idx = idx[best]
+    hit_idx[missed] = -1
+    return dist, hit_idx, x_face
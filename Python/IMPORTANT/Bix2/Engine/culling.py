@@ -0,0 +1,78 @@
+import math
+
+
+# -------------------------
+# VIEW WEDGE
+# -------------------------
+class ViewWedge:
+    """What one frame can see: the slice of the eye-height plane between
+    yaw - fov/2 and yaw + fov/2, out to max_dist.
+
+    Tests are conservative (a box may pass that no ray actually hits), so
+    the result is a candidate list for the exact ray tests.
+    """
+    __slots__ = ("ox", "oy", "oz", "max_dist", "planes", "box")
+
+    def __init__(self, ox, oy, oz, yaw, fov, max_dist, margin=0.01):
+        self.ox = ox
+        self.oy = oy
+        self.oz = oz
+        self.max_dist = max_dist
+
+        # a little wider than the fov so edge columns never lose a part
+        a0 = yaw - fov / 2 - margin
+        a1 = yaw + fov / 2 + margin
+
+        # inside = on the right of the left edge and the left of the right
+        # edge, both as (nx, nz) with n . (p - o) >= 0. Only valid < 180 deg.
+        if a1 - a0 < math.pi:
+            self.planes = (
+                (-math.sin(a0), math.cos(a0)),
+                (math.sin(a1), -math.cos(a1)),
+            )
+        else:
+            self.planes = ()
+
+        # XZ bounding box of the wedge: the apex, both arc ends and any
+        # axis-aligned extreme of the arc that falls inside the wedge
+        xs = [ox, ox + math.cos(a0) * max_dist, ox + math.cos(a1) * max_dist]
+        zs = [oz, oz + math.sin(a0) * max_dist, oz + math.sin(a1) * max_dist]
+        for k in range(math.ceil(a0 / (math.pi / 2)), math.floor(a1 / (math.pi / 2)) + 1):
+            a = k * math.pi / 2
+            xs.append(ox + round(math.cos(a)) * max_dist)
+            zs.append(oz + round(math.sin(a)) * max_dist)
+        self.box = (min(xs), oy, min(zs), max(xs), oy, max(zs))
+
+    def sees(self, b):
+        """Can any ray of the frame reach the box b = part.bounds()?"""
+        ox, oz = self.ox, self.oz
+        if not (b[1] <= self.oy <= b[4]):
+            return False
+
+        # nearest point of the box within max_dist
+        dx = b[0] - ox if ox < b[0] else (ox - b[3] if ox > b[3] else 0.0)
+        dz = b[2] - oz if oz < b[2] else (oz - b[5] if oz > b[5] else 0.0)
+        if dx * dx + dz * dz > self.max_dist * self.max_dist:
+            return False
+
+        # box entirely outside either edge -> culled
+        for nx, nz in self.planes:
+            far_x = b[3] if nx > 0.0 else b[0]
+            far_z = b[5] if nz > 0.0 else b[2]
+            if nx * (far_x - ox) + nz * (far_z - oz) < 0.0:
+                return False
+        return True
+
+    def cull(self, index, limit=None):
+        """Collidable parts in a spatial index that the frame can see.
+
+        With a limit, returns None as soon as more than limit parts pass,
+        for a caller that would then use the index's own traversal anyway.
+        """
+        out = []
+        for part in index.query_box(*self.box):
+            if part.collidable and self.sees(part.bounds()):
+                out.append(part)
+                if limit is not None and len(out) > limit:
+                    return None
+        return out
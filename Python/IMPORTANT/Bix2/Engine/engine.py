@@ -1,58 +1,207 @@
+import math
 import time
 import os
 
+from Engine.math3d import Vec3
 from Engine.world import World
-from Engine.input import InputState
+from Engine.input import InputState, ScriptedInput
 from Engine.renderer import Renderer
+from Engine.scheduler import Scheduler
+from Engine.profiler import Profiler
 from Engine.loader import load_workspace, load_scripts
+from Engine.watcher import Watcher
+from Engine.streaming import ChunkStreamer
+from Engine.replay import InputRecorder, ReplayInput
 
 
 class Engine:
-    def __init__(self):
+    def __init__(self, workspace=None, scripts=None, headless=False, inputs=None, watch=None,
+                 record=None, replay=None):
         self.running = False
-        self.dt = 1 / 60
+
+        # fixed-timestep simulation, rendering runs as fast as allowed
+        self.tick_rate = 60
+        self.dt = 1 / self.tick_rate
+        self.tick = 0
+        self.max_frame_time = 0.25  # clamp after a stall instead of spiralling
+        self._accumulator = 0.0
+        self._prev_pos = None
+        self._view_pos = Vec3()   # reused by view_pose every frame
+        self._prev_yaw = 0.0
+
+        # ms spent per phase in the last frame, plus the renderer's
+        # current render_scale (moved by its adaptive controller)
+        self.timings = {"input": 0.0, "update": 0.0, "scripts": 0.0, "render": 0.0,
+                        "render_scale": 1.0}
 
         # core systems
+        # headless: offscreen surface + scripted input, no window at all
+        # replay: input from a recording, one recorded tick per tick
         self.world = World()
-        self.input = InputState()
-        self.renderer = Renderer(self)
+        self.scheduler = Scheduler()
+        if replay is not None:
+            self.input = ReplayInput(replay)
+            self.tick_rate = self.input.tick_rate
+            self.dt = 1 / self.tick_rate
+        elif headless or inputs is not None:
+            self.input = ScriptedInput(inputs, pump=not headless)
+        else:
+            self.input = InputState()
+        self.renderer = Renderer(self, headless=headless)
+
+        # per-frame timings and counters, off until started (or F3)
+        self.profiler = Profiler(self)
+        self.renderer.overlays.append(self.profiler.draw_overlay)
 
         # paths
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
         ROOT_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
 
         # load data
-        load_workspace(self, os.path.join(ROOT_DIR, "Workspace"))
-        load_scripts(self.world, os.path.join(ROOT_DIR, "ScriptService"))
+        workspace = workspace or os.path.join(ROOT_DIR, "Workspace")
+        scripts = scripts or os.path.join(ROOT_DIR, "ScriptService")
+        sources = load_workspace(self, workspace)
+        load_scripts(self.world, scripts)
 
-        # 🔥 RUN SCRIPTS ONCE
+        if replay is not None:
+            x, y, z, yaw = self.input.start
+            self.world.player.pos.set(x, y, z)
+            self.world.player.yaw = yaw
+
+        # a chunked workspace streams in around the player instead. A replay
+        # waits for every chunk, so collisions can't depend on load timing.
+        self.streamer = ChunkStreamer.open(self.world, workspace)
+        if self.streamer is not None:
+            self.streamer.sync = replay is not None
+            self.streamer.load_now(self.world.player.pos)
+
+        # 🔥 RUN SCRIPTS ONCE (on_start / on_update then run from the loop)
         self.world.run_scripts(self)
 
+        # hot reload of .part / .bix edits, off by default when headless
+        if watch is None:
+            watch = not headless
+        self.watcher = Watcher(self, workspace, scripts, sources) if watch else None
+
+        # every tick's input, written out on stop()
+        self.recorder = InputRecorder(self, record) if record else None
+
+        # recording or replaying: every script callback runs every tick, not
+        # just what fits the time budget, so a replay can't depend on speed
+        self.deterministic = record is not None or replay is not None
+
     def run(self):
         self.running = True
-        last_time = time.time()
+        last_time = time.perf_counter()
 
         while self.running:
-            now = time.time()
-            self.dt = now - last_time
+            now = time.perf_counter()
+            frame_time = now - last_time
             last_time = now
 
-            self.input.update()
-            if self.input.quit:
-                self.stop()
-                break
+            self.step(frame_time)
+
+            # nothing changed on screen: sleep until the next tick is due
+            # instead of spinning on an identical frame
+            if self.running and self.renderer.rays_cast == 0:
+                time.sleep(max(0.0, self.dt - self._accumulator))
+
+    def step(self, frame_time):
+        """One frame: input, as many fixed ticks as frame_time covers, render."""
+        t0 = time.perf_counter()
+        self.input.update()
+        if self.input.quit:
+            self.stop()
+            return
+        t1 = time.perf_counter()
+
+        if self.watcher is not None:
+            self.watcher.poll()
+        if self.streamer is not None:
+            self.streamer.update(self.world.player.pos)
 
+        self.dt = 1 / self.tick_rate
+        self._accumulator += min(frame_time, self.max_frame_time)
+        scripts_time = 0.0
+        deadline = None
+        while self._accumulator >= self.dt:
+            p = self.world.player
+            if self._prev_pos is None:
+                self._prev_pos = p.pos.copy()
+            else:
+                self._prev_pos.set(p.pos)
+            self._prev_yaw = p.yaw
+
+            if self.recorder is not None:
+                self.recorder.tick(self.input)
+            if self.input.pressed("profiler"):
+                self.profiler.toggle_overlay()
             self.update_player()
-            self.renderer.draw()
+
+            # scripts share one budget per frame, however many ticks run
+            s0 = time.perf_counter()
+            if deadline is None:
+                deadline = math.inf if self.deterministic else s0 + self.scheduler.budget_ms / 1000
+            self.scheduler.step(self.dt, deadline)
+            scripts_time += time.perf_counter() - s0
+            self.input.end_tick()
+
+            self.tick += 1
+            self._accumulator -= self.dt
+            if self.input.quit:
+                break   # a replay ran out: no ticks without its input
+        t2 = time.perf_counter()
+
+        # draw between the last two ticks so motion stays smooth
+        pos, yaw = self.view_pose(self._accumulator / self.dt)
+        self.renderer.draw(pos, yaw)
+        t3 = time.perf_counter()
+
+        self.timings["input"] = (t1 - t0) * 1000
+        self.timings["update"] = (t2 - t1 - scripts_time) * 1000
+        self.timings["scripts"] = scripts_time * 1000
+        self.timings["render"] = (t3 - t2) * 1000
+
+        # a cached frame cast nothing: its time says nothing about the
+        # render cost, and would let the scale creep up while idle
+        if self.renderer.rays_cast:
+            self.renderer.adapt((t3 - t0) * 1000)
+        self.timings["render_scale"] = self.renderer.render_scale
+
+        if self.profiler.enabled:
+            self.profiler.record()
+
+    def view_pose(self, alpha):
+        """Player pose interpolated between the previous and current tick.
+
+        The position is one Vec3 reused every frame: copy it to keep it.
+        """
+        p = self.world.player
+        if self._prev_pos is None:
+            return p.pos, p.yaw
+
+        prev = self._prev_pos
+        pos = self._view_pos.set(
+            prev.x + (p.pos.x - prev.x) * alpha,
+            prev.y + (p.pos.y - prev.y) * alpha,
+            prev.z + (p.pos.z - prev.z) * alpha,
+        )
+        return pos, self._prev_yaw + (p.yaw - self._prev_yaw) * alpha
 
     def stop(self):
         self.running = False
+        if self.streamer is not None:
+            self.streamer.close()
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.recorder is not None:
+            self.recorder.save()
+            self.recorder = None
 
     def update_player(self):
         p = self.world.player
         p.yaw += self.input.turn * p.rot_speed * self.dt
 
-        import math
         dx = math.cos(p.yaw) * self.input.forward * p.speed * self.dt
         dz = math.sin(p.yaw) * self.input.forward * p.speed * self.dt
 
@@ -1,35 +1,153 @@
 import pygame
 
 
-class InputState:
-    def __init__(self):
-        # movement axes
+# action -> keys that trigger it; rebind with bind()
+DEFAULT_BINDINGS = {
+    "forward": (pygame.K_w,),
+    "back": (pygame.K_s,),
+    "left": (pygame.K_a,),
+    "right": (pygame.K_d,),
+    "profiler": (pygame.K_F3,),
+}
+
+
+class Actions:
+    """Action state shared by every input source.
+
+    Level: down(action) is true while any of its keys is held. Edges:
+    pressed(action) / released(action) are true for one tick after the key
+    went down / up. Edges are kept until the engine finishes a tick
+    (end_tick), so a press between two ticks is never lost and is never
+    seen twice, however many frames or ticks run.
+    """
+
+    def __init__(self, bindings=None):
         self.forward = 0.0   # -1 back, +1 forward
         self.turn = 0.0      # -1 left, +1 right
-
         self.quit = False
 
+        self.held = set()        # actions down right now
+        self._down_keys = set()  # key codes down right now
+        self._pressed = set()    # actions that went down since the last tick
+        self._released = set()
+        self._keys = {}          # key code -> [actions]
+        for action, keys in (bindings or DEFAULT_BINDINGS).items():
+            self.bind(action, *keys)
+
+    def bind(self, action, *keys):
+        """Trigger action from keys, given as pygame key codes or names ("space")."""
+        for key in keys:
+            if isinstance(key, str):
+                key = pygame.key.key_code(key)
+            actions = self._keys.setdefault(key, [])
+            if action not in actions:
+                actions.append(action)
+
+    def unbind(self, action):
+        for actions in self._keys.values():
+            if action in actions:
+                actions.remove(action)
+        self.held.discard(action)
+
+    # -------------------------
+    # QUERIES
+    # -------------------------
+    def down(self, action):
+        return action in self.held
+
+    def pressed(self, action):
+        return action in self._pressed
+
+    def released(self, action):
+        return action in self._released
+
+    def end_tick(self):
+        """The engine ran a tick: every edge has now been seen once."""
+        self._pressed.clear()
+        self._released.clear()
+
+    # -------------------------
+    # FEEDING
+    # -------------------------
+    def key_down(self, key):
+        self._down_keys.add(key)
+        for action in self._keys.get(key, ()):
+            if action not in self.held:
+                self.held.add(action)
+                self._pressed.add(action)
+
+    def key_up(self, key):
+        self._down_keys.discard(key)
+        for action in self._keys.get(key, ()):
+            # another key bound to the same action may still be down
+            still = any(action in self._keys.get(k, ()) for k in self._down_keys)
+            if action in self.held and not still:
+                self.held.discard(action)
+                self._released.add(action)
+
+    def release_all(self):
+        self._released |= self.held
+        self.held.clear()
+        self._down_keys.clear()
+
+    def _update_axes(self):
+        held = self.held
+        self.forward = float(("forward" in held) - ("back" in held))
+        self.turn = float(("right" in held) - ("left" in held))
+
+
+class InputState(Actions):
+    """Keyboard input from the pygame event queue.
+
+    The only place the engine reads events: update() drains the queue once
+    per frame and turns KEYDOWN/KEYUP into action state, with no polling of
+    the keyboard. The window itself belongs to the Renderer.
+    """
+
+    def __init__(self, bindings=None):
         pygame.init()
-        pygame.display.set_mode((1, 1))  # hidden dummy window
+        super().__init__(bindings)
 
     def update(self):
-        self.forward = 0.0
-        self.turn = 0.0
-
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.quit = True
+            elif event.type == pygame.KEYDOWN:
+                self.key_down(event.key)
+            elif event.type == pygame.KEYUP:
+                self.key_up(event.key)
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # the key-ups will go to another window
+                self.release_all()
+        self._update_axes()
+
+
+class ScriptedInput(Actions):
+    """Drop-in for InputState that plays back (forward, turn) pairs.
 
-        keys = pygame.key.get_pressed()
+    Used for headless runs and benchmarks. Each update() consumes one
+    frame; quit is raised once the frames run out. frames=None idles
+    forever. With pump=True (a real window) the event queue is still
+    drained, so the window stays responsive and can be closed.
+    """
+
+    def __init__(self, frames=None, pump=False):
+        super().__init__()
+        self._frames = iter(frames) if frames is not None else None
+        self._pump = pump
+
+    def update(self):
+        if self._pump:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit = True
 
-        # forward / backward
-        if keys[pygame.K_w]:
-            self.forward += 1.0
-        if keys[pygame.K_s]:
-            self.forward -= 1.0
+        if self._frames is None:
+            return
 
-        # turn left / right
-        if keys[pygame.K_a]:
-            self.turn -= 1.0
-        if keys[pygame.K_d]:
-            self.turn += 1.0
+        try:
+            self.forward, self.turn = next(self._frames)
+        except StopIteration:
+            self.forward = 0.0
+            self.turn = 0.0
+            self.quit = True
@@ -1,6 +1,15 @@
+import hashlib
+import math
+import marshal
+import mmap
 import os
+import struct
+import sys
+from array import array
+from importlib.util import MAGIC_NUMBER
 from Engine.math3d import Vec3
-from Engine.part import Part
+from Engine.part import ORIGINS, Part
+from Engine.spatial import INDEX_TYPES
 
 
 def hex_to_rgb(hex_str):
@@ -8,27 +17,259 @@ def hex_to_rgb(hex_str):
     return tuple(int(hex_str[i:i+2], 16) for i in (0, 2, 4))
 
 
+# packed workspace: one file of columns instead of one .part file per part
+PACK_NAME = "workspace.bixpack"
+PACK_MAGIC = b"BIXP"
+PACK_VERSION = 2   # v2 adds a texture column, v1 packs still load
+_PACK_HEADER = struct.Struct("<4sII")   # magic, version, part count
+
+# workspace-wide settings, same key:value format as .part files
+SETTINGS_NAME = "workspace.cfg"
+
+# chunked workspace: Workspace/chunks/<i>_<k>.bixpack, one pack per square
+# of the XZ plane, streamed in around the player (see Engine.streaming)
+CHUNK_DIR = "chunks"
+CHUNK_SETTINGS = "chunks.cfg"   # size: chunk edge length in world units
+
+
 def load_workspace(engine, path="Workspace"):
+    """Load parts into engine.world. Returns {source file: [parts]}."""
+    folder = os.path.dirname(path) if os.path.isfile(path) else path
+    settings = load_settings(folder)
+    engine.world.origin = settings["origin"]
+    engine.world.floor = settings["floor"]
+    engine.world.ceiling = settings["ceiling"]
+    engine.world.set_index(settings["index"])
+
+    # a packed workspace wins over loose .part files
+    if os.path.isfile(path):
+        return _load_pack(engine, path)
     if not os.path.isdir(path):
-        return
+        return {}
+
+    # and chunks win over both; the engine's streamer loads them
+    if os.path.isfile(os.path.join(path, CHUNK_DIR, CHUNK_SETTINGS)):
+        return {}
+
+    # a pack is built from the .part files; rebuild it once they move on
+    pack = os.path.join(path, PACK_NAME)
+    if os.path.isfile(pack) and pack_is_stale(path):
+        print(f"[Loader] {PACK_NAME} is older than the .part files, repacking")
+        try:
+            pack_workspace(path)
+        except (OSError, ValueError) as e:
+            print(f"[Loader] Repack failed ({e}), loading the .part files")
+            return _load_part_files(engine, path)
+    if os.path.isfile(pack):
+        return _load_pack(engine, pack)
+    return _load_part_files(engine, path)
+
 
+def _load_part_files(engine, path):
+    sources = {}
     for filename in os.listdir(path):
-        if not filename.endswith(".part"):
+        if filename.endswith(".part"):
+            filepath = os.path.join(path, filename)
+            sources[filepath] = [load_part_file(filepath, engine.world.origin)]
+    engine.world.add_parts([p for parts in sources.values() for p in parts])
+    return sources
+
+
+def _load_pack(engine, filepath):
+    parts = read_pack(filepath)
+    engine.world.add_parts(parts)
+    return {filepath: parts}
+
+
+def pack_workspace(path="Workspace", out=None):
+    """Convert a folder of .part files into a single packed workspace file."""
+    origin = load_settings(path)["origin"]
+    parts = []
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith(".part"):
+            parts.append(load_part_file(os.path.join(path, filename), origin))
+
+    out = out or os.path.join(path, PACK_NAME)
+    write_pack(out, parts)
+    return out, len(parts)
+
+
+def pack_is_stale(path="Workspace"):
+    """True if a .part file was added, edited or deleted since the pack was written.
+
+    A folder with a pack but no .part files left is never stale: the pack
+    is then the only copy of the parts.
+    """
+    packed = os.stat(os.path.join(path, PACK_NAME)).st_mtime_ns
+    found = False
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.endswith(".part"):
+                found = True
+                if entry.stat().st_mtime_ns > packed:
+                    return True
+    # a deleted .part only shows in the folder's own mtime
+    return found and os.stat(path).st_mtime_ns > packed
+
+
+def pack_chunks(path="Workspace", size=32.0):
+    """Split a workspace (pack or .part files) into chunk packs by part centre.
+
+    Any chunk packs already in the chunks folder are replaced.
+    """
+    pack = os.path.join(path, PACK_NAME)
+    if os.path.isfile(pack) and not pack_is_stale(path):
+        parts = read_pack(pack)
+    else:
+        origin = load_settings(path)["origin"]
+        parts = [
+            load_part_file(os.path.join(path, filename), origin)
+            for filename in sorted(os.listdir(path)) if filename.endswith(".part")
+        ]
+
+    chunks = {}
+    for part in parts:
+        pos = part.pos
+        chunks.setdefault(chunk_of(pos.x, pos.z, size), []).append(part)
+
+    out = os.path.join(path, CHUNK_DIR)
+    os.makedirs(out, exist_ok=True)
+    for filename in os.listdir(out):
+        if filename.endswith(".bixpack"):
+            os.remove(os.path.join(out, filename))
+    for (i, k), chunk in chunks.items():
+        write_pack(os.path.join(out, f"{i}_{k}.bixpack"), chunk)
+    with open(os.path.join(out, CHUNK_SETTINGS), "w", encoding="utf-8") as f:
+        f.write(f"size: {size:g}\n")
+    return out, len(parts), len(chunks)
+
+
+def chunk_of(x, z, size):
+    """(i, k) of the chunk holding the XZ point (x, z)."""
+    return math.floor(x / size), math.floor(z / size)
+
+
+def list_chunks(path="Workspace"):
+    """(chunk size, {(i, k): pack path}) of a chunked workspace, or None."""
+    folder = os.path.join(path, CHUNK_DIR)
+    cfg = os.path.join(folder, CHUNK_SETTINGS)
+    if not os.path.isfile(cfg):
+        return None
+
+    size = float(_read_kv_file(cfg).get("size", "0"))
+    if size <= 0:
+        raise ValueError(f"{cfg}: size must be positive")
+
+    files = {}
+    for filename in os.listdir(folder):
+        name, ext = os.path.splitext(filename)
+        if ext != ".bixpack":
+            continue
+        try:
+            i, k = (int(v) for v in name.split("_"))
+        except ValueError:
             continue
+        files[(i, k)] = os.path.join(folder, filename)
+    return size, files
+
+
+def write_pack(filepath, parts):
+    # pack positions are always part centres, whatever the workspace origin
+    n = len(parts)
+    pos = array("f", [v for p in parts for v in (p.pos.x, p.pos.y, p.pos.z)])
+    size = array("f", [v for p in parts for v in (p.size.x, p.size.y, p.size.z)])
+    color = bytes(c for p in parts for c in p.color)
+    collidable = bytes(1 if p.collidable else 0 for p in parts)
+
+    # textures: an id column plus a table of paths relative to the pack
+    folder = os.path.dirname(os.path.abspath(filepath))
+    names = {}
+    texture = array("h", [
+        -1 if p.texture is None else names.setdefault(p.texture, len(names))
+        for p in parts
+    ])
+    table = b"".join(
+        _name_bytes(os.path.relpath(name, folder).replace(os.sep, "/"))
+        for name in names
+    )
+
+    # columns are stored little-endian
+    if sys.byteorder == "big":
+        pos.byteswap()
+        size.byteswap()
+        texture.byteswap()
+
+    with open(filepath, "wb") as f:
+        f.write(_PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, n))
+        f.write(pos.tobytes())
+        f.write(size.tobytes())
+        f.write(color)
+        f.write(collidable)
+        f.write(texture.tobytes())
+        f.write(struct.pack("<I", len(names)))
+        f.write(table)
+
+
+def _name_bytes(name):
+    data = name.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
 
-        filepath = os.path.join(path, filename)
-        data = _read_kv_file(filepath)
 
-        pos = Vec3(*_parse_vec(data.get("pos", "0,0,0")))
-        size = Vec3(*_parse_vec(data.get("size", "1,1,1")))
-        collidable = data.get("collidable", "true").lower() == "true"
+def read_pack(filepath):
+    """Memory-map a packed workspace and build its parts. Returns a list."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, n = _PACK_HEADER.unpack_from(mm, 0)
+            if magic != PACK_MAGIC or not 1 <= version <= PACK_VERSION:
+                raise ValueError(f"{filepath}: not a Bix workspace pack (v{PACK_VERSION})")
 
-        color = (200, 200, 200)
-        if "color" in data:
-            color = hex_to_rgb(data["color"])
+            off = _PACK_HEADER.size
+            pos = _floats(mm, off, n * 3)
+            off += n * 12
+            size = _floats(mm, off, n * 3)
+            off += n * 12
+            color = mm[off:off + n * 3]
+            off += n * 3
+            collidable = mm[off:off + n]
+            off += n
 
-        part = Part(pos, size, collidable, color)
-        engine.world.add_part(part)
+            texture, names = None, []
+            if version >= 2:
+                texture, names = _read_textures(mm, off, n, os.path.dirname(filepath))
+
+    parts = []
+    for i in range(n):
+        j = i * 3
+        x, y, z = pos[j], pos[j + 1], pos[j + 2]
+        hx, hy, hz = size[j] / 2, size[j + 1] / 2, size[j + 2] / 2
+        parts.append(Part.from_bounds(
+            (x - hx, y - hy, z - hz, x + hx, y + hy, z + hz),
+            collidable[i] != 0,
+            (color[j], color[j + 1], color[j + 2]),
+            names[texture[i]] if texture is not None and texture[i] >= 0 else None,
+        ))
+    return parts
+
+
+def _read_textures(buf, off, n, folder):
+    # id column, then a count and length-prefixed utf-8 paths
+    texture = array("h")
+    texture.frombytes(buf[off:off + n * 2])
+    if sys.byteorder == "big":
+        texture.byteswap()
+    off += n * 2
+
+    (count,) = struct.unpack_from("<I", buf, off)
+    off += 4
+    names = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", buf, off)
+        off += 2
+        names.append(_resolve(folder, buf[off:off + length].decode("utf-8")))
+        off += length
+    return texture, names
 
 
 def load_scripts(world, path="ScriptService"):
@@ -37,11 +278,146 @@ def load_scripts(world, path="ScriptService"):
 
     for filename in os.listdir(path):
         if filename.endswith(".bix"):
-            with open(os.path.join(path, filename), "r", encoding="utf-8") as f:
-                code = f.read()
+            filepath = os.path.join(path, filename)
+            try:
+                code = compile_script(filepath)
+            except SyntaxError as e:
+                print("Script error:", e)
+                continue
 
             print(f"[Loader] Loaded script: {filename}")
-            world.add_script(code)
+            world.add_script(code, filepath)
+
+
+# -------------------------
+# SCRIPT COMPILE CACHE
+# -------------------------
+CACHE_DIR = "__bixcache__"
+_compiled = {}   # filepath -> (source hash, code object)
+
+
+def compile_script(filepath, source=None):
+    """Compile a .bix file, reusing the code object while its source is unchanged.
+
+    Code objects are kept in memory and in ScriptService/__bixcache__, keyed
+    by a hash of the source, so unchanged scripts skip compile() entirely.
+    """
+    if source is None:
+        with open(filepath, "r", encoding="utf-8") as f:
+            source = f.read()
+    digest = hashlib.sha256(source.encode("utf-8")).digest()
+
+    cached = _compiled.get(filepath)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    cache_path = _cache_path(filepath)
+    code = _read_cached_code(cache_path, digest)
+    if code is None:
+        code = compile(source, filepath, "exec")
+        _write_cached_code(cache_path, digest, code)
+
+    _compiled[filepath] = (digest, code)
+    return code
+
+
+def _cache_path(filepath):
+    folder, filename = os.path.split(filepath)
+    tag = sys.implementation.cache_tag or "py"
+    return os.path.join(folder, CACHE_DIR, f"{filename}.{tag}.bixc")
+
+
+def _read_cached_code(cache_path, digest):
+    # layout: interpreter magic, source sha256, marshalled code
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    head = len(MAGIC_NUMBER)
+    if data[:head] != MAGIC_NUMBER or data[head:head + 32] != digest:
+        return None
+    try:
+        return marshal.loads(data[head + 32:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cached_code(cache_path, digest, code):
+    # the cache is only an optimisation, never fail a load over it
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC_NUMBER + digest + marshal.dumps(code))
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+def load_settings(path="Workspace"):
+    """Settings from the workspace's workspace.cfg, defaults filled in.
+
+    origin: centre  - a part's pos is its centre (Bix2, the default)
+    origin: corner  - a part's pos is its min corner (Bix workspaces)
+    floor / ceiling - "#RRGGBB" or an image path; unset = background colour
+    index: grid     - uniform grid over XZ, best for mazes (the default)
+    index: bvh      - bounding volume tree, for open or uneven scenes
+    """
+    settings = {"origin": "centre", "floor": None, "ceiling": None, "index": "grid"}
+    cfg = os.path.join(path, SETTINGS_NAME)
+    if os.path.isfile(cfg):
+        settings.update(_read_kv_file(cfg))
+
+    for key in ("floor", "ceiling"):
+        value = settings[key]
+        if value:
+            settings[key] = hex_to_rgb(value) if value.startswith("#") else _resolve(path, value)
+
+    origin = settings["origin"].lower()
+    if origin == "center":
+        origin = "centre"
+    if origin not in ORIGINS:
+        raise ValueError(f"{cfg}: origin must be one of {', '.join(ORIGINS)}")
+    settings["origin"] = origin
+
+    index = settings["index"].lower()
+    if index not in INDEX_TYPES:
+        raise ValueError(f"{cfg}: index must be one of {', '.join(INDEX_TYPES)}")
+    settings["index"] = index
+    return settings
+
+
+def load_part_file(filepath, origin="centre"):
+    data = _read_kv_file(filepath)
+
+    pos = Vec3(*_parse_vec(data.get("pos", "0,0,0")))
+    size = Vec3(*_parse_vec(data.get("size", "1,1,1")))
+    collidable = data.get("collidable", "true").lower() == "true"
+
+    color = (200, 200, 200)
+    if "color" in data:
+        color = hex_to_rgb(data["color"])
+
+    # texture paths are relative to the .part file
+    texture = None
+    if data.get("texture"):
+        texture = _resolve(os.path.dirname(filepath), data["texture"])
+
+    return Part(pos, size, collidable, color, origin, texture)
+
+
+def _resolve(folder, path):
+    return os.path.normpath(os.path.join(os.path.abspath(folder), path))
+
+
+def _floats(buf, offset, count):
+    out = array("f")
+    out.frombytes(buf[offset:offset + count * 4])
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out
 
 
 def _read_kv_file(path):
@@ -1,3 +1,11 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class Vec3:
     __slots__ = ("x", "y", "z")
 
@@ -9,6 +17,41 @@ class Vec3:
     def copy(self):
         return Vec3(self.x, self.y, self.z)
 
+    # in-place ops: update an existing vector instead of making a new one,
+    # for anything done every tick or every frame. All return self.
+    def set(self, x, y=None, z=None):
+        """set(other) copies another Vec3, set(x, y, z) sets the components."""
+        if y is None:
+            x, y, z = x.x, x.y, x.z
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        return self
+
+    def iadd(self, other):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def isub(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def imul(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        return self
+
+    def dot(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
     # basic ops (useful later)
     def __add__(self, other):
         return Vec3(
@@ -33,3 +76,135 @@ class Vec3:
 
     def __repr__(self):
         return f"Vec3({self.x}, {self.y}, {self.z})"
+
+
+# -------------------------
+# BATCHED VECTORS (NumPy)
+# -------------------------
+class Vec3Array:
+    """n vectors as one float64 (n, 3) NumPy array, for work on many at once.
+
+    Arithmetic takes another Vec3Array, a single Vec3 (applied to every
+    row), a scalar or one scalar per row. The i-versions and normalize()
+    work in place; indexing with an int gives a Vec3 copy, with a slice or
+    mask a Vec3Array view.
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data=0):
+        if np is None:
+            raise ImportError("Vec3Array needs numpy")
+        if isinstance(data, int):
+            data = np.zeros((data, 3))
+        else:
+            data = np.asarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError(f"expected shape (n, 3), got {data.shape}")
+        self.data = data
+
+    @classmethod
+    def from_vecs(cls, vecs):
+        return cls([(v.x, v.y, v.z) for v in vecs])
+
+    @classmethod
+    def from_angles(cls, angles, y=0.0):
+        """Unit XZ directions for yaw angles, as the engine's rays use them."""
+        angles = np.asarray(angles, dtype=np.float64)
+        data = np.empty((len(angles), 3))
+        data[:, 0] = np.cos(angles)
+        data[:, 1] = y
+        data[:, 2] = np.sin(angles)
+        return cls(data)
+
+    def to_vecs(self):
+        return [Vec3(x, y, z) for x, y, z in self.data.tolist()]
+
+    def copy(self):
+        return Vec3Array(self.data.copy())
+
+    # component columns, as views
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def z(self):
+        return self.data[:, 2]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            x, y, z = self.data[i].tolist()
+            return Vec3(x, y, z)
+        return Vec3Array(self.data[i])
+
+    def __setitem__(self, i, value):
+        self.data[i] = _operand(value)
+
+    # -------------------------
+    # ARITHMETIC
+    # -------------------------
+    def __add__(self, other):
+        return Vec3Array(self.data + _operand(other))
+
+    def __sub__(self, other):
+        return Vec3Array(self.data - _operand(other))
+
+    def __mul__(self, scalar):
+        return Vec3Array(self.data * _scalars(scalar))
+
+    def iadd(self, other):
+        self.data += _operand(other)
+        return self
+
+    def isub(self, other):
+        self.data -= _operand(other)
+        return self
+
+    def imul(self, scalar):
+        self.data *= _scalars(scalar)
+        return self
+
+    def set(self, other):
+        self.data[...] = _operand(other)
+        return self
+
+    def dot(self, other):
+        """Row-wise dot products, shape (n,)."""
+        return np.einsum("ij,ij->i", self.data, np.broadcast_to(_operand(other), self.data.shape))
+
+    def length(self):
+        return np.sqrt(np.einsum("ij,ij->i", self.data, self.data))
+
+    def normalize(self):
+        """Scale every row to length 1 in place; zero rows stay zero."""
+        length = self.length()
+        length[length == 0.0] = 1.0
+        self.data /= length[:, None]
+        return self
+
+    def normalized(self):
+        return self.copy().normalize()
+
+    def __repr__(self):
+        return f"Vec3Array({self.data!r})"
+
+
+def _operand(value):
+    if isinstance(value, Vec3):
+        return np.array((value.x, value.y, value.z))
+    if isinstance(value, Vec3Array):
+        return value.data
+    return np.asarray(value, dtype=np.float64)
+
+
+def _scalars(value):
+    # one scalar, or one per row broadcast across x, y and z
+    value = np.asarray(value, dtype=np.float64)
+    return value[:, None] if value.ndim == 1 else value
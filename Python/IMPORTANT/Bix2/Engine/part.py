@@ -1,26 +1,314 @@
+from array import array
 from Engine.math3d import Vec3
 
+_EMPTY = (float("inf"),) * 3 + (float("-inf"),) * 3   # a box nothing can hit
+
+# what a part's pos means: its centre (Bix2) or its min corner (Bix)
+ORIGINS = ("centre", "corner")
+
+
+def box_bounds(pos, size, origin="centre"):
+    """(minx, miny, minz, maxx, maxy, maxz) of a box placed by pos."""
+    if origin == "corner":
+        return (pos.x, pos.y, pos.z, pos.x + size.x, pos.y + size.y, pos.z + size.z)
+    hx = size.x / 2
+    hy = size.y / 2
+    hz = size.z / 2
+    return (pos.x - hx, pos.y - hy, pos.z - hz, pos.x + hx, pos.y + hy, pos.z + hz)
+
+
 class Part:
-    __slots__ = ("pos", "size", "collidable", "color")
+    """A box part. Once added to a World it is a view onto the World's
+    PartStore row; until then it keeps its own values.
+
+    Only the bounds are kept, so pos is always read back as the centre
+    (corner gives the min corner), whatever origin the part was made with.
+    Bounds are stored as float32, so pos/size read back rounded to that.
+    """
+    __slots__ = ("_store", "_row", "_b", "_collidable", "_color", "_texture")
+
+    def __init__(self, pos: Vec3, size: Vec3, collidable=True, color=(200, 200, 200),
+                 origin="centre", texture=None):
+        self._store = None
+        self._row = -1
+        self._b = array("f", box_bounds(pos, size, origin))
+        self._collidable = bool(collidable)
+        self._color = tuple(color)
+        self._texture = texture   # image path, or None for flat colour
+
+    @classmethod
+    def from_bounds(cls, bounds, collidable=True, color=(200, 200, 200), texture=None):
+        """A detached part from (minx, miny, minz, maxx, maxy, maxz)."""
+        part = cls.__new__(cls)
+        part._store = None
+        part._row = -1
+        part._b = array("f", bounds)
+        part._collidable = bool(collidable)
+        part._color = tuple(color)
+        part._texture = texture
+        return part
+
+    @classmethod
+    def _view(cls, store, row):
+        # a part that starts out as a view onto an existing store row
+        part = cls.__new__(cls)
+        part._store = store
+        part._row = row
+        part._b = part._collidable = part._color = part._texture = None
+        return part
+
+    # -------------------------
+    # PROPERTIES
+    # -------------------------
+    def bounds(self):
+        """(minx, miny, minz, maxx, maxy, maxz) of the box."""
+        s = self._store
+        if s is None:
+            return tuple(self._b)
+        i = self._row
+        return (s.minx[i], s.miny[i], s.minz[i], s.maxx[i], s.maxy[i], s.maxz[i])
+
+    def set_bounds(self, minx, miny, minz, maxx, maxy, maxz):
+        s = self._store
+        if s is None:
+            self._b = array("f", (minx, miny, minz, maxx, maxy, maxz))
+            return
+        i = self._row
+        s.minx[i] = minx
+        s.miny[i] = miny
+        s.minz[i] = minz
+        s.maxx[i] = maxx
+        s.maxy[i] = maxy
+        s.maxz[i] = maxz
+
+    @property
+    def pos(self):
+        b = self.bounds()
+        return Vec3((b[0] + b[3]) / 2, (b[1] + b[4]) / 2, (b[2] + b[5]) / 2)
+
+    @pos.setter
+    def pos(self, pos):
+        self.set_bounds(*box_bounds(pos, self.size))
+
+    @property
+    def corner(self):
+        b = self.bounds()
+        return Vec3(b[0], b[1], b[2])
+
+    @corner.setter
+    def corner(self, pos):
+        self.set_bounds(*box_bounds(pos, self.size, "corner"))
+
+    @property
+    def size(self):
+        b = self.bounds()
+        return Vec3(b[3] - b[0], b[4] - b[1], b[5] - b[2])
+
+    @size.setter
+    def size(self, size):
+        # grows around the centre; use resize() to keep the corner instead
+        self.set_bounds(*box_bounds(self.pos, size))
+
+    def resize(self, size, origin="centre"):
+        """Set the size keeping the centre or the min corner where it is."""
+        if origin == "corner":
+            self.set_bounds(*box_bounds(self.corner, size, "corner"))
+        else:
+            self.size = size
+
+    @property
+    def collidable(self):
+        s = self._store
+        if s is None:
+            return self._collidable
+        return s.collidable[self._row] != 0
+
+    @collidable.setter
+    def collidable(self, value):
+        s = self._store
+        if s is None:
+            self._collidable = bool(value)
+        else:
+            s.collidable[self._row] = 1 if value else 0
+
+    @property
+    def color(self):
+        s = self._store
+        if s is None:
+            return self._color
+        j = self._row * 3
+        c = s.color
+        return (c[j], c[j + 1], c[j + 2])
+
+    @color.setter
+    def color(self, value):
+        s = self._store
+        if s is None:
+            self._color = tuple(value)
+        else:
+            j = self._row * 3
+            s.color[j:j + 3] = array("B", value)
 
-    def __init__(self, pos: Vec3, size: Vec3, collidable=True, color=(200, 200, 200)):
-        self.pos = pos
-        self.size = size
-        self.collidable = collidable
-        self.color = color  # new color attribute
+    @property
+    def texture(self):
+        s = self._store
+        if s is None:
+            return self._texture
+        t = s.texture[self._row]
+        return s.texture_names[t] if t >= 0 else None
+
+    @texture.setter
+    def texture(self, value):
+        s = self._store
+        if s is None:
+            self._texture = value
+        else:
+            s.texture[self._row] = s.texture_id(value)
 
     # Axis-Aligned Bounding Box (AABB) point test
     def intersects_point(self, p):
-        hx = self.size.x / 2
-        hy = self.size.y / 2
-        hz = self.size.z / 2
-
+        minx, miny, minz, maxx, maxy, maxz = self.bounds()
         return (
-            self.pos.x - hx <= p.x <= self.pos.x + hx and
-            self.pos.y - hy <= p.y <= self.pos.y + hy and
-            self.pos.z - hz <= p.z <= self.pos.z + hz
+            minx <= p.x <= maxx and
+            miny <= p.y <= maxy and
+            minz <= p.z <= maxz
         )
 
-
     def __repr__(self):
         return f"Part(pos={self.pos}, size={self.size}, collidable={self.collidable}, color={self.color})"
+
+
+# -------------------------
+# PART STORE (SoA)
+# -------------------------
+class PartStore:
+    """Every part of a World as columns: float32 bounds, RGB bytes, a
+    collidable flag and a texture id per row.
+
+    Part objects added here become views onto their row. Removed rows are
+    emptied (an inside-out box, not collidable) and reused. Kernels can wrap
+    the columns with numpy.frombuffer, but must drop those views before the
+    store grows again.
+    """
+
+    def __init__(self):
+        self.minx = array("f")
+        self.miny = array("f")
+        self.minz = array("f")
+        self.maxx = array("f")
+        self.maxy = array("f")
+        self.maxz = array("f")
+        self.color = array("B")        # r, g, b per row
+        self.collidable = array("B")   # 0 for free rows too
+        self.texture = array("h")      # index into texture_names, -1 = none
+        self.texture_names = []
+        self.parts = []                # row -> Part, None for free rows
+        self._free = []
+        self._texture_ids = {}
+
+    def texture_id(self, name):
+        if name is None:
+            return -1
+        i = self._texture_ids.get(name)
+        if i is None:
+            i = self._texture_ids[name] = len(self.texture_names)
+            self.texture_names.append(name)
+        return i
+
+    def __len__(self):
+        return len(self.parts)
+
+    def add(self, part):
+        if part._store is not None:
+            raise ValueError("part already belongs to a world")
+        if not self._free:
+            self.add_many([part])
+            return
+
+        i = self._free.pop()
+        self.parts[i] = part
+        part._store = self
+        part._row = i
+        part.set_bounds(*part._b)
+        part.collidable = part._collidable
+        part.color = part._color
+        part.texture = part._texture
+        part._b = part._color = part._texture = None
+
+    def add_many(self, parts):
+        # free rows are refilled first, the rest is a bulk append: one
+        # extend per column
+        for part in parts:
+            if part._store is not None:
+                raise ValueError("part already belongs to a world")
+
+        reuse = min(len(self._free), len(parts))
+        for part in parts[:reuse]:
+            self.add(part)
+        parts = parts[reuse:]
+
+        row = len(self.parts)
+        self.minx.extend([p._b[0] for p in parts])
+        self.miny.extend([p._b[1] for p in parts])
+        self.minz.extend([p._b[2] for p in parts])
+        self.maxx.extend([p._b[3] for p in parts])
+        self.maxy.extend([p._b[4] for p in parts])
+        self.maxz.extend([p._b[5] for p in parts])
+        self.color.extend([c for p in parts for c in p._color])
+        self.collidable.extend([1 if p._collidable else 0 for p in parts])
+        self.texture.extend([self.texture_id(p._texture) for p in parts])
+        self.parts.extend(parts)
+
+        for part in parts:
+            part._store = self
+            part._row = row
+            part._b = part._color = part._texture = None
+            row += 1
+
+    def add_columns(self, minx, miny, minz, maxx, maxy, maxz, color, collidable):
+        """Append rows straight from column data and return their Parts.
+
+        color is flat r, g, b bytes and collidable one 0/1 per row. No
+        detached Parts are built first and free rows are left for add(),
+        so this is the cheap path for bulk creation (CreateAPI.parts).
+        """
+        row = len(self.parts)
+        n = len(minx)
+        self.minx.extend(minx)
+        self.miny.extend(miny)
+        self.minz.extend(minz)
+        self.maxx.extend(maxx)
+        self.maxy.extend(maxy)
+        self.maxz.extend(maxz)
+        self.color.extend(color)
+        self.collidable.extend(collidable)
+        self.texture.extend(array("h", [-1]) * n)
+
+        view = Part._view
+        parts = [view(self, i) for i in range(row, row + n)]
+        self.parts.extend(parts)
+        return parts
+
+    def remove(self, part):
+        # the part keeps its values and can be added again later
+        if part._store is not self:
+            return
+        i = part._row
+        b = array("f", part.bounds())
+        collidable = part.collidable
+        color = part.color
+        texture = part.texture
+
+        part._store = None
+        part._row = -1
+        part._b = b
+        part._collidable = collidable
+        part._color = color
+        part._texture = texture
+
+        self.parts[i] = None
+        self.minx[i], self.miny[i], self.minz[i] = _EMPTY[:3]
+        self.maxx[i], self.maxy[i], self.maxz[i] = _EMPTY[3:]
+        self.collidable[i] = 0
+        self.texture[i] = -1
+        self._free.append(i)
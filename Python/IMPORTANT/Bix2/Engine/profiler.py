@@ -0,0 +1,131 @@
+import csv
+import json
+from collections import deque
+
+import pygame
+from Engine.raycast import stats
+
+
+class Profiler:
+    """Per-frame timings and counters for the engine.
+
+    Once enabled, the engine calls record() after every frame. Each frame
+    becomes a row: phase times in ms, plus counts of rays cast, traversal
+    steps (grid cells / BVH nodes), ray-part tests and collision box tests.
+    The overlay draws a running average on screen (toggled by the
+    "profiler" input action, F3), and dump() writes the kept rows to CSV
+    or JSON.
+
+    Off by default: until start() the engine pays nothing for it.
+    """
+
+    FIELDS = ("frame", "frame_ms", "input", "update", "scripts", "render",
+              "rays", "steps", "tests", "collisions", "render_scale")
+
+    def __init__(self, engine, history=600):
+        self.engine = engine
+        self.enabled = False
+        self.overlay = False
+        self.frames = deque(maxlen=history)
+        self.script_ms = {}   # script -> ms in its callbacks last frame
+
+        self._frame = 0
+        self._last = None
+        self._font = None
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._last = None
+        self.engine.scheduler.times = {}
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.start()
+        else:
+            self.engine.renderer.invalidate()  # uncover what it was drawn over
+
+    # -------------------------
+    # RECORDING
+    # -------------------------
+    def record(self):
+        engine = self.engine
+        counters = (stats.rays, stats.steps, stats.tests, engine.world.collision_tests)
+        last, self._last = self._last, counters
+        if last is None:
+            return  # first frame only sets the baseline
+
+        t = engine.timings
+        row = {
+            "frame": self._frame,
+            "frame_ms": t["input"] + t["update"] + t["scripts"] + t["render"],
+            "input": t["input"],
+            "update": t["update"],
+            "scripts": t["scripts"],
+            "render": t["render"],
+            "rays": counters[0] - last[0],
+            "steps": counters[1] - last[1],
+            "tests": counters[2] - last[2],
+            "collisions": counters[3] - last[3],
+            "render_scale": t["render_scale"],
+        }
+        self._frame += 1
+        self.frames.append(row)
+        self.script_ms = engine.scheduler.take_times()
+
+    def summary(self, last=None):
+        """Mean of every field over the last n frames (all kept by default)."""
+        rows = list(self.frames)[-last:] if last else list(self.frames)
+        if not rows:
+            return {}
+        return {f: sum(r[f] for r in rows) / len(rows) for f in self.FIELDS if f != "frame"}
+
+    # -------------------------
+    # OUTPUT
+    # -------------------------
+    def dump(self, path):
+        """Write the kept frames to path, CSV or JSON by its extension."""
+        rows = list(self.frames)
+        if path.lower().endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.summary(), "frames": rows}, f, indent=1)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+
+    def draw_overlay(self, screen):
+        if not self.overlay:
+            return
+        if self._font is None:
+            pygame.font.init()
+            self._font = pygame.font.Font(None, 18)
+
+        s = self.summary(30)
+        lines = ["profiler (F3)"]
+        if s:
+            lines += [
+                f"frame   {s['frame_ms']:6.2f} ms",
+                f"input   {s['input']:6.2f} ms",
+                f"update  {s['update']:6.2f} ms",
+                f"scripts {s['scripts']:6.2f} ms",
+                f"render  {s['render']:6.2f} ms  x{s['render_scale']:.2f}",
+                f"rays {s['rays']:.0f}  steps {s['steps']:.0f}",
+                f"tests {s['tests']:.0f}  collide {s['collisions']:.0f}",
+            ]
+            top = sorted(self.script_ms.items(), key=lambda kv: -kv[1])[:3]
+            lines += [f"  {_short(name)} {ms:.2f} ms" for name, ms in top]
+
+        # opaque box, so over a cached frame it never smears
+        height = 16 * len(lines) + 8
+        screen.fill((0, 0, 0), (4, 4, 220, height))
+        for i, text in enumerate(lines):
+            screen.blit(self._font.render(text, True, (220, 220, 220)), (10, 8 + 16 * i))
+
+
+def _short(name):
+    name = str(name)
+    return name.replace("\\", "/").rsplit("/", 1)[-1]
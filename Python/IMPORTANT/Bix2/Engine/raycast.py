@@ -2,38 +2,273 @@ import math
 from Engine.math3d import Vec3
 
 
-def cast_ray(origin: Vec3, angle: float, parts, max_dist=15.0, step=0.5):
-    ox = origin.x
-    oz = origin.z
-    oy = origin.y
-
-    dx = math.cos(angle) * step
-    dz = math.sin(angle) * step
-
-    x = ox
-    z = oz
-    dist = 0.0
-
-    while dist < max_dist:
-        x += dx
-        z += dz
-        dist += step
-
-        # manual probe (NO Vec3 creation)
-        for part in parts:
-            if not part.collidable:
-                continue
-
-            # quick AABB test inline (FAST)
-            hx = part.size.x * 0.5
-            hz = part.size.z * 0.5
-            hy = part.size.y * 0.5
-
-            if (
-                part.pos.x - hx <= x <= part.pos.x + hx and
-                part.pos.y - hy <= oy <= part.pos.y + hy and
-                part.pos.z - hz <= z <= part.pos.z + hz
-            ):
-                return dist
-
-    return max_dist
+# -------------------------
+# COUNTERS
+# -------------------------
+class RayStats:
+    """Running totals for benchmarks and the profiler: rays cast,
+    traversal steps (grid cells or BVH nodes visited) and ray-part tests."""
+    __slots__ = ("rays", "steps", "tests")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.rays = 0
+        self.steps = 0
+        self.tests = 0
+
+
+stats = RayStats()
+
+
+# -------------------------
+# HIT RESULT
+# -------------------------
+class RayHit:
+    """distance and part, plus point (world-space hit point), normal
+    (outward face normal) and u (0..1 across the hit face, for texturing).
+
+    Built from a caster's raw result: the ray (origin, unit direction) and
+    the entry face normal (nx, nz). point, normal and u are worked out on
+    first access, so a renderer that only needs distance and part
+    allocates no vectors.
+    """
+    __slots__ = ("distance", "part", "_point", "_normal", "_u", "_ray")
+
+    def __init__(self, distance, part, ox, oy, oz, dx, dz, nx, nz):
+        self.distance = distance
+        self.part = part
+        self._point = self._normal = self._u = None
+        self._ray = (ox, oy, oz, dx, dz, nx, nz)
+
+    @property
+    def point(self):
+        if self._point is None:
+            ox, oy, oz, dx, dz, _, _ = self._ray
+            self._point = Vec3(ox + dx * self.distance, oy, oz + dz * self.distance)
+        return self._point
+
+    @property
+    def normal(self):
+        if self._normal is None:
+            self._normal = Vec3(self._ray[5], 0.0, self._ray[6])
+        return self._normal
+
+    @property
+    def u(self):
+        if self._u is None:
+            ox, _, oz, dx, dz, nx, _ = self._ray
+            minx, _, minz, maxx, _, maxz = self.part.bounds()
+            if nx != 0.0:
+                w = maxz - minz
+                self._u = (oz + dz * self.distance - minz) / w if w > 0 else 0.0
+            else:
+                w = maxx - minx
+                self._u = (ox + dx * self.distance - minx) / w if w > 0 else 0.0
+        return self._u
+
+    def __repr__(self):
+        return f"RayHit(distance={self.distance}, part={self.part}, normal={self.normal}, u={self.u})"
+
+
+# -------------------------
+# RAY vs AABB (SLAB METHOD)
+# -------------------------
+def ray_box(ox, oy, oz, dx, dz, minx, miny, minz, maxx, maxy, maxz, max_dist):
+    """Intersect a horizontal ray with a box on the XZ plane.
+
+    (dx, dz) must be a unit direction. Returns (t, nx, nz) where t is the
+    distance to the entry face and (nx, nz) its outward normal, or None.
+    """
+    if not (miny <= oy <= maxy):
+        return None
+
+    # x slab
+    if dx > 0.0:
+        tx0 = (minx - ox) / dx
+        tx1 = (maxx - ox) / dx
+        nx = -1.0
+    elif dx < 0.0:
+        tx0 = (maxx - ox) / dx
+        tx1 = (minx - ox) / dx
+        nx = 1.0
+    else:
+        if not (minx <= ox <= maxx):
+            return None
+        tx0 = -math.inf
+        tx1 = math.inf
+        nx = 0.0
+
+    # z slab
+    if dz > 0.0:
+        tz0 = (minz - oz) / dz
+        tz1 = (maxz - oz) / dz
+        nz = -1.0
+    elif dz < 0.0:
+        tz0 = (maxz - oz) / dz
+        tz1 = (minz - oz) / dz
+        nz = 1.0
+    else:
+        if not (minz <= oz <= maxz):
+            return None
+        tz0 = -math.inf
+        tz1 = math.inf
+        nz = 0.0
+
+    t_exit = tx1 if tx1 < tz1 else tz1
+    if t_exit < 0.0:
+        return None
+
+    # entry face is the slab we crossed last
+    if tx0 > tz0:
+        t_enter, nz = tx0, 0.0
+    else:
+        t_enter, nx = tz0, 0.0
+
+    if t_enter > t_exit or t_enter > max_dist:
+        return None
+
+    # origin inside the box -> hit right away
+    if t_enter < 0.0:
+        t_enter = 0.0
+
+    return t_enter, nx, nz
+
+
+def ray_aabb(ox, oy, oz, dx, dz, part, max_dist):
+    """ray_box against a part's bounds."""
+    return ray_box(ox, oy, oz, dx, dz, *part.bounds(), max_dist)
+
+
+# -------------------------
+# BRUTE FORCE CASTER
+# -------------------------
+def cast_ray(origin: Vec3, angle: float, parts, max_dist=15.0):
+    """Cast a ray against every collidable part.
+
+    Returns the nearest RayHit within max_dist, or None.
+    """
+    ox, oy, oz = origin.x, origin.y, origin.z
+    dx = math.cos(angle)
+    dz = math.sin(angle)
+
+    best_t = max_dist
+    best_part = None
+    best_nx = best_nz = 0.0
+
+    tests = 0
+    for part in parts:
+        if not part.collidable:
+            continue
+        tests += 1
+        hit = ray_aabb(ox, oy, oz, dx, dz, part, best_t)
+        if hit is not None and (best_part is None or hit[0] < best_t):
+            best_t = hit[0]
+            best_part = part
+            best_nx, best_nz = hit[1], hit[2]
+
+    stats.rays += 1
+    stats.tests += tests
+
+    if best_part is None:
+        return None
+    return RayHit(best_t, best_part, ox, oy, oz, dx, dz, best_nx, best_nz)
+
+
+# -------------------------
+# GRID DDA CASTER
+# -------------------------
+def cast_ray_grid(origin: Vec3, angle: float, grid, max_dist=15.0):
+    """Same result as cast_ray, but only visits the cells the ray crosses.
+
+    grid is anything with a cell size and a {(i, k): [parts]} dict of XZ
+    cells, plus a list of large parts tested by every ray, i.e.
+    spatial.UniformGrid.
+    """
+    ox, oy, oz = origin.x, origin.y, origin.z
+    dx = math.cos(angle)
+    dz = math.sin(angle)
+    cell = grid.cell
+    cells = grid.cells
+
+    i = math.floor(ox / cell)
+    k = math.floor(oz / cell)
+
+    # distance to the first cell boundary and between boundaries, per axis
+    if dx > 0.0:
+        step_i = 1
+        t_max_x = ((i + 1) * cell - ox) / dx
+        t_delta_x = cell / dx
+    elif dx < 0.0:
+        step_i = -1
+        t_max_x = (i * cell - ox) / dx
+        t_delta_x = -cell / dx
+    else:
+        step_i = 0
+        t_max_x = t_delta_x = math.inf
+
+    if dz > 0.0:
+        step_k = 1
+        t_max_z = ((k + 1) * cell - oz) / dz
+        t_delta_z = cell / dz
+    elif dz < 0.0:
+        step_k = -1
+        t_max_z = (k * cell - oz) / dz
+        t_delta_z = -cell / dz
+    else:
+        step_k = 0
+        t_max_z = t_delta_z = math.inf
+
+    best_t = max_dist
+    best_part = None
+    best_nx = best_nz = 0.0
+    t_cell = 0.0
+    tests = 0
+    steps = 0
+
+    for part in grid.large:
+        if not part.collidable:
+            continue
+        tests += 1
+        hit = ray_aabb(ox, oy, oz, dx, dz, part, best_t)
+        if hit is not None and (best_part is None or hit[0] < best_t):
+            best_t = hit[0]
+            best_part = part
+            best_nx, best_nz = hit[1], hit[2]
+
+    while t_cell <= max_dist:
+        steps += 1
+        bucket = cells.get((i, k))
+        if bucket:
+            for part in bucket:
+                if not part.collidable:
+                    continue
+                tests += 1
+                hit = ray_aabb(ox, oy, oz, dx, dz, part, best_t)
+                if hit is not None and (best_part is None or hit[0] < best_t):
+                    best_t = hit[0]
+                    best_part = part
+                    best_nx, best_nz = hit[1], hit[2]
+
+        # a hit inside the current cell can't be beaten by later cells
+        t_next = t_max_x if t_max_x < t_max_z else t_max_z
+        if best_part is not None and best_t <= t_next:
+            break
+
+        if t_max_x < t_max_z:
+            t_cell = t_max_x
+            t_max_x += t_delta_x
+            i += step_i
+        else:
+            t_cell = t_max_z
+            t_max_z += t_delta_z
+            k += step_k
+
+    stats.rays += 1
+    stats.steps += steps
+    stats.tests += tests
+
+    if best_part is None:
+        return None
+    return RayHit(best_t, best_part, ox, oy, oz, dx, dz, best_nx, best_nz)
@@ -1,16 +1,31 @@
 import pygame
 import math
-from Engine.math3d import Vec3
-from Engine.raycast import cast_ray
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from Engine.culling import ViewWedge
+from Engine.math3d import Vec3Array
+from Engine.raycast import cast_ray, ray_box, stats
+
+try:
+    import numpy as np
+    from Engine.batchcast import PartArrays, cast_rays
+    from Engine.textures import TEX_SIZE, TextureBank
+except ImportError:  # numpy is optional, "lines" mode works without it
+    np = None
 
 
 class Renderer:
-    def __init__(self, engine):
+    def __init__(self, engine, headless=False, size=(800, 600)):
         self.engine = engine
+        self.headless = headless
 
         pygame.init()
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("Bix Engine")
+        if headless:
+            # offscreen target, never shown (CI / render nodes)
+            self.screen = pygame.Surface(size)
+        else:
+            self.screen = pygame.display.set_mode(size)
+            pygame.display.set_caption("Bix Engine")
 
         self.width, self.height = self.screen.get_size()
         self.clock = pygame.time.Clock()
@@ -18,52 +33,185 @@ class Renderer:
         # render settings
         self.fov = math.pi / 3  # 60 degrees
         self.bg_color = (25, 25, 25)
+        self.max_dist = 15.0
+        self.max_fps = None  # None = uncapped
+
+        # fraction of screen columns that get their own ray, each ray is
+        # stretched over its block of columns. Setting target_ms lets adapt()
+        # move render_scale between min_scale and 1 to hold that frame time.
+        self.render_scale = 1.0
+        self.target_ms = None
+        self.min_scale = 0.25
+        self._frame_ms = None
+        self._layout = None
+
+        # parts that survived view culling last frame. Lines mode tests each
+        # ray against that list only while it's short; past cull_limit parts
+        # the spatial index's own traversal is cheaper per ray, culling stops
+        # early and visible_parts is None.
+        self.visible_parts = 0
+        self.cull_limit = 8
+
+        # "lines" draws one pygame line per column, "numpy" casts every
+        # column in one batch and writes straight into the pixel buffer.
+        # Textures and floor/ceiling casting are numpy mode only, "lines"
+        # falls back to flat part colours on the background.
+        self.mode = "numpy" if np is not None else "lines"
+        self._arrays = None
+        self._pixels_version = -1
+        self._part_pixels = None
+        self._part_textures = None
+        self._shade_pixels = None
+        self._bg_pixel = 0
+        self.textures = TextureBank(self.screen) if np is not None else None
+        self._surfaces = {}   # floor/ceiling spec -> (texture id, pixel)
+
+        # numpy mode only: >1 splits the screen into column bands cast on a
+        # thread pool (numpy drops the GIL inside the kernels)
+        self.workers = 1
+        self._pool = None
+
+        # column cache: what each ray hit last frame and how far away. While
+        # the view key holds, an unchanged world costs nothing and a change
+        # only recasts the columns it can affect.
+        self.rays_cast = 0   # rays cast for the last frame
+        self._cache_key = None
+        self._cache_version = -1
+        self._col_rows = None   # store row each ray hit, -1 = miss
+        self._col_dist = None   # distance along each ray
+
+        # sprites are drawn after the walls, clipped per column by _col_dist.
+        # _sprite_rays are the rays whose columns they covered, recast to
+        # erase them when only sprites changed.
+        self._sprite_version = -1
+        self._sprite_rays = ()
+        self._sprite_data = None   # (world.sprite_version, numpy columns)
+        self._col_ray = None       # (edges, screen column -> ray index)
+
+        # callables(screen) drawn over every frame, e.g. the profiler. They
+        # must paint opaquely, since a cached frame is not redrawn under them.
+        self.overlays = []
+
+    def draw(self, pos=None, yaw=None):
+        # camera defaults to the player, the engine passes an interpolated pose
+        p = self.engine.world.player
+        pos = p.pos if pos is None else pos
+        yaw = p.yaw if yaw is None else yaw
+
+        world = self.engine.world
+        key = (self.mode, pos.x, pos.y, pos.z, yaw, self.fov, self.max_dist,
+               len(self.columns()[1]), self.bg_color, world.floor, world.ceiling)
+        sprites_changed = world.sprite_version != self._sprite_version
+        if key == self._cache_key and world.version == self._cache_version and not sprites_changed:
+            self.rays_cast = 0  # the screen still holds exactly this frame
+        elif self.mode == "numpy":
+            self._draw_world_numpy(pos, yaw, key)
+        else:
+            self._draw_world(pos, yaw, key)
 
-    def draw(self):
-        self._handle_quit()
-        self.screen.fill(self.bg_color)
-        self._draw_world()
-        pygame.display.flip()
-        self.clock.tick(60)
+        # sprites go over any redrawn walls; over untouched columns they
+        # land exactly where they already are
+        if self.rays_cast or sprites_changed:
+            if self.mode == "numpy":
+                self._draw_sprites_numpy(pos, yaw)
+            else:
+                self._draw_sprites(pos, yaw)
+            self._sprite_version = world.sprite_version
+        for overlay in self.overlays:
+            overlay(self.screen)
+        if not self.headless:
+            pygame.display.flip()
+            if self.max_fps:
+                self.clock.tick(self.max_fps)
+
+    def adapt(self, frame_ms):
+        """Nudge render_scale toward target_ms. The engine calls this per frame."""
+        if not self.target_ms:
+            return
+
+        # smoothed, so one slow frame doesn't flap the resolution
+        if self._frame_ms is None:
+            self._frame_ms = frame_ms
+        else:
+            self._frame_ms += (frame_ms - self._frame_ms) * 0.1
+
+        ratio = self.target_ms / max(self._frame_ms, 0.001)
+        if 0.9 <= ratio <= 1.1:
+            return  # close enough, hold steady
+        # drop quickly when slow, climb back gently when there's headroom
+        step = min(max(ratio, 0.9), 1.02)
+        self.render_scale = min(1.0, max(self.min_scale, self.render_scale * step))
+
+    def invalidate(self):
+        """Forget the cached frame, e.g. after drawing over the screen."""
+        self._cache_key = None
+
+    def columns(self):
+        """(edges, centres) for the current render scale.
+
+        Ray i covers screen columns edges[i]:edges[i + 1] and is cast
+        through the middle of that block, centres[i].
+        """
+        ray_count = max(1, min(self.width, round(self.width * self.render_scale)))
+        if self._layout is None or len(self._layout[1]) != ray_count:
+            edges = [self.width * i // ray_count for i in range(ray_count + 1)]
+            centres = [(edges[i] + edges[i + 1] - 1) / 2 for i in range(ray_count)]
+            self._layout = (edges, centres)
+        return self._layout
 
     # -------------------------
     # INTERNALS
     # -------------------------
-    def _draw_world(self):
-        p = self.engine.world.player
-        parts = self.engine.world.parts
+    def _draw_world(self, pos, yaw, key):
+        world = self.engine.world
 
         half_h = self.height // 2
-        ray_count = self.width 
+        edges, centres = self.columns()
+        angles = [yaw - self.fov / 2 + (centre / self.width) * self.fov for centre in centres]
 
-        for x in range(ray_count):
-            # calculate angle for this ray
-            ray_angle = p.yaw - self.fov / 2 + (x / ray_count) * self.fov
+        cols = None   # None = every ray
+        if key == self._cache_key:
+            cols = self._dirty_columns(world, pos, angles)
+            if cols is not None and world.sprite_version != self._sprite_version:
+                cols = sorted(set(cols).union(self._sprite_rays))
+        if cols is None:
+            cols = range(len(angles))
+            self._col_rows = [-1] * len(angles)
+            self._col_dist = [self.max_dist] * len(angles)
+            self.screen.fill(self.bg_color)
 
-            hit_part = None
-            dist = cast_ray(p.pos, ray_angle, parts)
+        # rays of the frame only test the parts inside the view wedge, while
+        # there are few enough of them to beat the index
+        candidates = None
+        if len(cols):
+            wedge = ViewWedge(pos.x, pos.y, pos.z, yaw, self.fov, self.max_dist)
+            candidates = wedge.cull(world.index, self.cull_limit)
+        self.visible_parts = None if candidates is None else len(candidates)
+        use_index = candidates is None
 
-            # find the part that was hit
-            hit_point = Vec3(
-                p.pos.x + math.cos(ray_angle) * dist,
-                p.pos.y,
-                p.pos.z + math.sin(ray_angle) * dist
-            )
-            for part in parts:
-                if part.collidable and part.intersects_point(hit_point):
-                    hit_part = part
-                    break
+        for i in cols:
+            ray_angle = angles[i]
+            x0, x1 = edges[i], edges[i + 1]
+
+            if use_index:
+                hit = world.raycast(pos, ray_angle, self.max_dist)
+            else:
+                hit = cast_ray(pos, ray_angle, candidates, self.max_dist)
+            dist = hit.distance if hit else self.max_dist
+            self._col_rows[i] = hit.part._row if hit else -1
+            self._col_dist[i] = dist
+            self.screen.fill(self.bg_color, (x0, 0, x1 - x0, self.height))
 
             # fish-eye correction
-            dist *= math.cos(ray_angle - p.yaw)
+            dist *= math.cos(ray_angle - yaw)
             if dist <= 0:
                 dist = 0.0001
 
             wall_height = int(self.height / dist)
 
             # pick color: part color or distance shade
-            if hit_part:
-                color = hit_part.color
+            if hit:
+                color = hit.part.color
             else:
                 shade = max(40, 255 - int(dist * 25))
                 color = (shade, shade, shade)
@@ -71,10 +219,430 @@ class Renderer:
             y1 = half_h - wall_height // 2
             y2 = half_h + wall_height // 2
 
-            pygame.draw.line(self.screen, color, (x, y1), (x, y2))
+            self.screen.fill(color, (x0, y1, x1 - x0, y2 - y1 + 1))
+
+        self.rays_cast = len(cols)
+        self._cache_key = key
+        self._cache_version = world.version
+
+    def _dirty_columns(self, world, pos, angles):
+        """Rays a change since the cached frame may affect, None = all of them.
+
+        That's rays whose cached hit changed, plus rays that a changed part
+        now blocks before their cached hit.
+        """
+        changed = world.changed_since(self._cache_version)
+        if changed is None or len(changed) > 64:
+            return None
+
+        blockers = []
+        for row in changed:
+            part = world.store.parts[row]
+            if part is not None and part.collidable:
+                blockers.append(part.bounds())
+
+        col_rows, col_dist = self._col_rows, self._col_dist
+        dirty = []
+        for i, angle in enumerate(angles):
+            if col_rows[i] in changed:
+                dirty.append(i)
+                continue
+            dx, dz = math.cos(angle), math.sin(angle)
+            for b in blockers:
+                if ray_box(pos.x, pos.y, pos.z, dx, dz, *b, col_dist[i]) is not None:
+                    dirty.append(i)
+                    break
+        return dirty
+
+    def _draw_world_numpy(self, pos, yaw, key):
+        world = self.engine.world
+
+        # zero-copy views onto the world's part store, only for this frame
+        self._arrays = PartArrays(world.store)
+        if self._pixels_version != world.version:
+            self._part_pixels = self._map_colors(self._arrays.color)
+            # store texture ids -> bank ids, the extra -1 catches untextured rows
+            lut = [self.textures.load(name) for name in world.store.texture_names]
+            self._part_textures = np.array(lut + [-1], dtype=np.intp)[self._arrays.texture]
+            self._pixels_version = world.version
+        if self._shade_pixels is None:
+            grey = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+            self._shade_pixels = self._map_colors(grey)
+
+        edges, centres = self.columns()
+        ray_count = len(centres)
+        angles = yaw - self.fov / 2 + np.array(centres) * (self.fov / self.width)
+        wedge = ViewWedge(pos.x, pos.y, pos.z, yaw, self.fov, self.max_dist)
+        idx = self._arrays.in_view(wedge)
+        self.visible_parts = len(idx)
+        self._bg_pixel = self.screen.map_rgb(self.bg_color)
+        floor = self._surface(world.floor)
+        ceiling = self._surface(world.ceiling)
+        view = (pos.x, pos.z, yaw, angles, idx, floor, ceiling, edges)
+
+        cols = None   # None = every ray
+        if key == self._cache_key:
+            cols = self._dirty_columns_numpy(world, pos, angles)
+            if cols is not None and world.sprite_version != self._sprite_version:
+                cols = np.union1d(cols, np.asarray(self._sprite_rays, dtype=np.intp))
+        if cols is None:
+            self._col_rows = np.full(ray_count, -1, dtype=np.intp)
+            self._col_dist = np.full(ray_count, self.max_dist, dtype=np.float32)
+
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        try:
+            if cols is not None:
+                if len(cols):
+                    self._draw_rays(pixels, cols, view)
+            elif self.workers > 1:
+                # bands write disjoint column slices of the same pixel buffer
+                bands = self._bands(ray_count)
+                pool = self._get_pool()
+                for f in [pool.submit(self._draw_band, pixels, x0, x1, view) for x0, x1 in bands]:
+                    f.result()
+            else:
+                self._draw_band(pixels, 0, ray_count, view)
+        finally:
+            del pixels  # unlock the surface before flip
+            self._arrays = None  # release the store's buffers so it can grow
+
+        self.rays_cast = ray_count if cols is None else len(cols)
+        self._cache_key = key
+        self._cache_version = world.version
+        stats.rays += self.rays_cast
+        stats.tests += self.rays_cast * len(idx)
+
+    def _dirty_columns_numpy(self, world, pos, angles):
+        # same as _dirty_columns, one batch cast against the changed rows
+        changed = world.changed_since(self._cache_version)
+        if changed is None:
+            return None
+
+        rows = np.fromiter(changed, dtype=np.intp, count=len(changed))
+        arrays = self._arrays
+        dirty = np.isin(self._col_rows, rows)
+
+        oy = pos.y
+        rows = rows[(arrays.collidable[rows] != 0) & (arrays.miny[rows] <= oy) & (oy <= arrays.maxy[rows])]
+        if len(rows):
+            dist, hit, _ = cast_rays(pos.x, pos.z, angles, arrays, rows, self.max_dist)
+            dirty |= (hit >= 0) & (dist <= self._col_dist)
+        return np.flatnonzero(dirty)
+
+    def _draw_band(self, pixels, x0, x1, view):
+        # x0:x1 are ray indices, edges maps them to screen columns
+        edges = view[-1]
+        out = self._cast_columns(slice(x0, x1), view)
+
+        s0, s1 = edges[x0], edges[x1]
+        if s1 - s0 == x1 - x0:
+            pixels[s0:s1] = out
+        else:
+            pixels[s0:s1] = np.repeat(out, np.diff(edges[x0:x1 + 1]), axis=0)
+
+    def _draw_rays(self, pixels, cols, view):
+        # scattered rays: write each one's block of screen columns
+        edges = np.asarray(view[-1])
+        out = self._cast_columns(cols, view)
+
+        starts = edges[cols]
+        widths = edges[cols + 1] - starts
+        first = np.repeat(np.cumsum(widths) - widths, widths)
+        screen = np.repeat(starts, widths) + (np.arange(widths.sum()) - first)
+        pixels[screen] = np.repeat(out, widths, axis=0)
+
+    def _cast_columns(self, cols, view):
+        """Cast and shade the rays in cols (slice or index array)."""
+        ox, oz, yaw, angles, idx, floor, ceiling, edges = view
+        angles = angles[cols]
+
+        ray_dist, hit, x_face = cast_rays(ox, oz, angles, self._arrays, idx, self.max_dist)
+        self._col_rows[cols] = hit
+        self._col_dist[cols] = ray_dist
+
+        # fish-eye correction
+        dist = ray_dist * np.cos(angles - yaw)
+        dist[dist <= 0] = 0.0001
+
+        wall_height = (self.height / dist).astype(np.int64)
+        half_h = self.height // 2
+        y1 = half_h - wall_height // 2
+        y2 = half_h + wall_height // 2
+
+        # part color or distance shade
+        shade = np.maximum(40, 255 - (dist * 25).astype(np.int64))
+        colors = self._shade_pixels[shade]
+        hit_mask = hit >= 0
+        colors[hit_mask] = self._part_pixels[hit[hit_mask]]
+
+        rows = np.arange(self.height)
+        span = (rows[None, :] >= y1[:, None]) & (rows[None, :] <= y2[:, None])
+
+        out = np.where(span, colors[:, None], self._bg_pixel)
+        self._backdrop(out, ox, oz, yaw, angles, floor, ceiling, y1, y2)
+
+        tex = np.full(len(hit), -1, dtype=np.intp)
+        tex[hit_mask] = self._part_textures[hit[hit_mask]]
+        textured = np.flatnonzero(tex >= 0)
+        if len(textured):
+            # u across the hit face, v down the wall, as in RayHit.u
+            a = angles[textured]
+            h = hit[textured]
+            t = ray_dist[textured]
+            arrays = self._arrays
+            xf = x_face[textured]
+            along = np.where(xf, oz + np.sin(a) * t, ox + np.cos(a) * t)
+            lo = np.where(xf, arrays.minz[h], arrays.minx[h])
+            width = np.where(xf, arrays.maxz[h], arrays.maxx[h]) - lo
+            u = (along - lo) / np.where(width > 0, width, 1.0)
+            tx = np.clip((u * TEX_SIZE).astype(np.intp), 0, TEX_SIZE - 1)
+
+            wall = self.height / dist[textured]
+            v = (rows[None, :] + 0.5 - (half_h - wall / 2)[:, None]) / wall[:, None]
+            ty = np.clip((v * TEX_SIZE).astype(np.intp), 0, TEX_SIZE - 1)
+
+            texels = self.textures.pixels[tex[textured][:, None], tx[:, None], ty]
+            out[textured] = np.where(span[textured], texels, out[textured])
+        return out
+
+    def _backdrop(self, out, ox, oz, yaw, angles, floor, ceiling, y1, y2):
+        """Floor/ceiling casting into a band, above and below each wall span.
+
+        Only rows the walls leave uncovered are cast, so a close wall costs
+        nothing behind it.
+        """
+        if floor is None and ceiling is None:
+            return
+
+        height = self.height
+        half_h = height // 2
+        if (floor and floor[0] >= 0) or (ceiling and ceiling[0] >= 0):
+            # texel coords straight from world coords, one tile per unit;
+            # float32 and a power-of-two wrap keep this cheap. The offset
+            # (whole tiles) keeps coords positive so truncation == floor.
+            offset = TEX_SIZE * 2 ** 14
+            fix = (1.0 / np.cos(angles - yaw)).astype(np.float32)
+            step_x = (np.cos(angles) * fix).astype(np.float32)
+            step_z = (np.sin(angles) * fix).astype(np.float32)
+
+        # column j of each view is the row k = j + 1 away from the horizon,
+        # which sees the plane at perpendicular distance height / 2k, like
+        # a wall that tall; the wall span covers k up to its half height
+        for surface, view, covered in (
+            (floor, out[:, half_h + 1:], y2 - half_h),
+            (ceiling, out[:, :half_h][:, ::-1], half_h - y1),
+        ):
+            if surface is None:
+                continue
+            k = np.arange(1, view.shape[1] + 1)
+            shown = k[None, :] > covered[:, None]
+            tid, pixel = surface
+            if tid < 0:
+                view[shown] = pixel
+                continue
+
+            # past the band's tallest wall every column shows the plane:
+            # cast that block whole, and only mask the ragged rows above it
+            along = (height * TEX_SIZE / (2.0 * k)).astype(np.float32)
+            pixels = self.textures.pixels[tid]
+            base_x = np.float32(ox * TEX_SIZE + offset)
+            base_z = np.float32(oz * TEX_SIZE + offset)
+            full = min(max(int(covered.max()), 0), len(k))
+
+            a = along[full:]
+            tx = (step_x[:, None] * a + base_x).astype(np.intp) & (TEX_SIZE - 1)
+            tz = (step_z[:, None] * a + base_z).astype(np.intp) & (TEX_SIZE - 1)
+            view[:, full:] = pixels[tx, tz]
+
+            col, j = np.nonzero(shown[:, :full])
+            a = along[j]
+            tx = (step_x[col] * a + base_x).astype(np.intp) & (TEX_SIZE - 1)
+            tz = (step_z[col] * a + base_z).astype(np.intp) & (TEX_SIZE - 1)
+            view[col, j] = pixels[tx, tz]
+
+    # -------------------------
+    # SPRITES
+    # -------------------------
+    def _draw_sprites(self, pos, yaw):
+        """Sprites as flat-colour blocks, one fill per ray block they cover."""
+        world = self.engine.world
+        self._sprite_rays = ()
+        if not world.sprites:
+            return
+
+        edges = self.columns()[0]
+        px_per_rad = self.width / self.fov
+        half_h = self.height // 2
+
+        visible = []
+        for sprite in world.sprites:
+            dx = sprite.pos.x - pos.x
+            dz = sprite.pos.z - pos.z
+            dist = math.hypot(dx, dz)
+            angle = (math.atan2(dz, dx) - yaw + math.pi) % (2 * math.pi) - math.pi
+            depth = dist * math.cos(angle)
+            if depth > 0.05 and dist < self.max_dist:
+                visible.append((dist, angle, depth, sprite))
+        # far to near, so nearer sprites paint over farther ones
+        visible.sort(key=lambda v: -v[0])
+
+        rays = set()
+        for dist, angle, depth, sprite in visible:
+            w, h = sprite.size
+            half_w = w / 2 / depth * px_per_rad
+            left = (angle + self.fov / 2) * px_per_rad - half_w
+            scale = self.height / depth
+            top = half_h - (sprite.pos.y - pos.y + h / 2) * scale
+
+            x0 = max(0, math.ceil(left))
+            x1 = min(self.width, math.ceil(left + 2 * half_w))
+            y0 = max(0, math.ceil(top - 0.5))
+            y1 = min(self.height, math.ceil(top + h * scale - 0.5))
+            if x1 <= x0 or y1 <= y0:
+                continue
+
+            i = bisect_right(edges, x0) - 1
+            while i < len(edges) - 1 and edges[i] < x1:
+                # clipped per ray: only where the wall is behind the sprite
+                if self._col_dist[i] > dist:
+                    a = max(x0, edges[i])
+                    b = min(x1, edges[i + 1])
+                    self.screen.fill(sprite.color, (a, y0, b - a, y1 - y0))
+                    rays.add(i)
+                i += 1
+        self._sprite_rays = sorted(rays)
+
+    def _draw_sprites_numpy(self, pos, yaw):
+        """Every sprite projected, scaled and depth-clipped in one batch."""
+        world = self.engine.world
+        self._sprite_rays = ()
+        if not world.sprites:
+            return
+
+        positions, size, colors, tex = self._sprite_columns(world)
+        px_per_rad = self.width / self.fov
+        height = self.height
+
+        # same projection as the walls: screen x follows the ray angle and
+        # one unit is height / depth pixels tall
+        rel = positions - pos
+        dist = np.hypot(rel.x, rel.z)
+        angle = (np.arctan2(rel.z, rel.x) - yaw + math.pi) % (2 * math.pi) - math.pi
+        depth = dist * np.cos(angle)
+        near = np.flatnonzero((depth > 0.05) & (dist < self.max_dist))
+        if not len(near):
+            return
+        # far to near, so nearer sprites paint over farther ones
+        near = near[np.argsort(-dist[near], kind="stable")]
+        dist, angle, depth = dist[near], angle[near], depth[near]
+        w, h = size[near, 0], size[near, 1]
+
+        half_w = w / 2 / depth * px_per_rad
+        left = (angle + self.fov / 2) * px_per_rad - half_w
+        scale = height / depth
+        top = height // 2 - (rel.y[near] + h / 2) * scale
+        tall = h * scale
+
+        x0 = np.clip(np.ceil(left), 0, self.width).astype(np.intp)
+        x1 = np.clip(np.ceil(left + 2 * half_w), 0, self.width).astype(np.intp)
+        y0 = np.clip(np.ceil(top - 0.5), 0, height).astype(np.intp)
+        y1 = np.clip(np.ceil(top + tall - 0.5), 0, height).astype(np.intp)
+
+        # (sprite, screen column) pairs, clipped by each column's wall distance
+        width = np.where(y1 > y0, np.maximum(x1 - x0, 0), 0)
+        s, col = _runs(x0, width)
+        col_ray = self._column_rays()
+        keep = self._col_dist[col_ray[col]] > dist[s]
+        s, col = s[keep], col[keep]
+        if not len(s):
+            return
+        self._sprite_rays = np.unique(col_ray[col])
+        tx = np.clip(((col - left[s]) / (2 * half_w[s]) * TEX_SIZE).astype(np.intp), 0, TEX_SIZE - 1)
+
+        # pairs are grouped far to near; one block write per sprite (its
+        # columns x its rows) keeps that order where sprites overlap
+        ends = np.cumsum(np.bincount(s, minlength=len(near))).tolist()
+        colors = colors[near].tolist()
+        tex = tex[near].tolist()
+        bank = self.textures
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        try:
+            start = 0
+            for i, end in enumerate(ends):
+                if end == start:
+                    continue
+                cols = col[start:end]
+                rows = slice(y0[i], y1[i])
+                if tex[i] < 0:
+                    pixels[cols, rows] = colors[i]
+                else:
+                    ty = (np.arange(y0[i], y1[i]) + 0.5 - top[i]) / tall[i] * TEX_SIZE
+                    ty = np.clip(ty.astype(np.intp), 0, TEX_SIZE - 1)
+                    u = tx[start:end, None]
+                    opaque = bank.opaque[tex[i]][u, ty]
+                    pixels[cols, rows] = np.where(opaque, bank.pixels[tex[i]][u, ty], pixels[cols, rows])
+                start = end
+        finally:
+            del pixels
+
+    def _sprite_columns(self, world):
+        # sprite positions, sizes, pixels and bank texture ids, rebuilt only
+        # when a sprite changed
+        data = self._sprite_data
+        if data is None or data[0] != world.sprite_version:
+            sprites = world.sprites
+            n = len(sprites)
+            rgb = np.array([s.color for s in sprites], dtype=np.uint8).reshape(n, 3)
+            data = self._sprite_data = (
+                world.sprite_version,
+                Vec3Array.from_vecs([s.pos for s in sprites]),
+                np.array([s.size for s in sprites], dtype=np.float64).reshape(n, 2),
+                self._map_colors(rgb),
+                np.array([self.textures.load(s.texture) if s.texture else -1 for s in sprites],
+                         dtype=np.intp),
+            )
+        return data[1:]
+
+    def _column_rays(self):
+        # screen column -> index of the ray drawn there
+        edges = self.columns()[0]
+        if self._col_ray is None or self._col_ray[0] is not edges:
+            rays = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+            self._col_ray = (edges, rays)
+        return self._col_ray[1]
+
+    def _surface(self, spec):
+        # floor/ceiling spec -> (texture id, pixel); texture id -1 = flat colour
+        if spec is None:
+            return None
+        if spec not in self._surfaces:
+            if isinstance(spec, str):
+                tid = self.textures.load(spec)
+                surface = (tid, self._bg_pixel) if tid >= 0 else None
+            else:
+                surface = (-1, self.screen.map_rgb(spec))
+            self._surfaces[spec] = surface
+        return self._surfaces[spec]
+
+    def _map_colors(self, rgb):
+        # (n, 3) RGB -> (n,) surface pixel ints, so bands never lock the surface
+        if len(rgb) == 0:
+            return np.zeros(0, dtype=np.uint32)
+        return pygame.surfarray.map_array(self.screen, rgb[:, None, :])[:, 0]
+
+    def _bands(self, ray_count):
+        n = min(self.workers, ray_count)
+        edges = [ray_count * i // n for i in range(n + 1)]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
 
-    def _handle_quit(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                self.engine.stop()
+def _runs(starts, lengths):
+    """Expand runs: (run index, starts[run] + k) for k < lengths[run]."""
+    run = np.repeat(np.arange(len(lengths)), lengths)
+    offset = np.arange(len(run)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return run, starts[run] + offset
@@ -0,0 +1,124 @@
+import struct
+import zlib
+
+from Engine.input import Actions
+from Engine.loader import _name_bytes
+
+# recorded input: header, action names, then one zlib-compressed record per
+# simulation tick, so a replay is independent of the frame rate it ran at
+REPLAY_MAGIC = b"BIXR"
+REPLAY_VERSION = 1
+# doubles, so a replay reproduces the recorded trajectory bit for bit
+_HEADER = struct.Struct("<4sHHI4d")   # magic, version, tick rate, ticks, x, y, z, yaw
+_TICK = struct.Struct("<ddIII")       # forward, turn, held / pressed / released masks
+
+
+class InputRecorder:
+    """Records what the engine's input was on every tick.
+
+    tick() is called by the engine at the start of each fixed tick and
+    save() writes everything to path. Actions are stored as bits, named in
+    the file's header, so bindings can change between record and replay.
+    """
+
+    def __init__(self, engine, path):
+        self.path = path
+        self.tick_rate = engine.tick_rate
+        p = engine.world.player
+        self.start = (p.pos.x, p.pos.y, p.pos.z, p.yaw)
+        self.actions = []   # bit -> action name
+        self._bits = {}
+        self._ticks = bytearray()
+
+    def tick(self, actions):
+        self._ticks += _TICK.pack(
+            actions.forward, actions.turn,
+            self._mask(actions.held), self._mask(actions._pressed), self._mask(actions._released),
+        )
+
+    def save(self):
+        names = b"".join(_name_bytes(name) for name in self.actions)
+        with open(self.path, "wb") as f:
+            f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate,
+                                 len(self._ticks) // _TICK.size, *self.start))
+            f.write(struct.pack("<H", len(self.actions)))
+            f.write(names)
+            f.write(zlib.compress(bytes(self._ticks)))
+
+    def _mask(self, actions):
+        mask = 0
+        for action in actions:
+            bit = self._bits.get(action)
+            if bit is None:
+                if len(self.actions) == 32:
+                    continue  # out of bits, don't fail the recording
+                bit = self._bits[action] = len(self.actions)
+                self.actions.append(action)
+            mask |= 1 << bit
+        return mask
+
+
+class ReplayInput(Actions):
+    """Plays a recording back one tick at a time, whatever the frame rate.
+
+    The engine sees exactly the forward/turn and action edges it saw when
+    recording; quit is raised once the ticks run out.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.tick_rate, self.start, self._actions, self._ticks = read_replay(path)
+        self._i = 0
+        self._apply()
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def update(self):
+        if self._i >= len(self._ticks):
+            self.quit = True
+
+    def end_tick(self):
+        super().end_tick()
+        self._i += 1
+        self._apply()
+        if self._i >= len(self._ticks):
+            self.quit = True   # no more ticks in this frame either
+
+    def _apply(self):
+        if self._i >= len(self._ticks):
+            self.forward = self.turn = 0.0
+            self.held.clear()
+            return
+        self.forward, self.turn, held, pressed, released = self._ticks[self._i]
+        self.held = self._names(held)
+        self._pressed = self._names(pressed)
+        self._released = self._names(released)
+
+    def _names(self, mask):
+        return {name for bit, name in enumerate(self._actions) if mask >> bit & 1}
+
+
+def read_replay(path):
+    """(tick rate, (x, y, z, yaw), action names, [tick tuples]) of a recording."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    magic, version, tick_rate, n, *start = _HEADER.unpack_from(data, 0)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(f"{path}: not a Bix input recording (v{REPLAY_VERSION})")
+
+    off = _HEADER.size
+    (count,) = struct.unpack_from("<H", data, off)
+    off += 2
+    actions = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", data, off)
+        off += 2
+        actions.append(data[off:off + length].decode("utf-8"))
+        off += length
+
+    body = zlib.decompress(data[off:])
+    if len(body) != n * _TICK.size:
+        raise ValueError(f"{path}: recording is truncated")
+    return tick_rate, tuple(start), actions, list(_TICK.iter_unpack(body))
@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+
+class Scheduler:
+    """Runs script callbacks inside the engine loop under a CPU time budget.
+
+    Each tick runs the registered on_update callbacks, then whatever timers
+    and coroutines are due, until the frame's budget is spent. Anything
+    left over waits for the next tick, round-robin, so one heavy script
+    can't stall rendering. A single callback is never interrupted though:
+    long jobs should be written as coroutines that yield.
+    """
+
+    def __init__(self, budget_ms=4.0):
+        self.budget_ms = budget_ms
+        self.time = 0.0   # seconds of simulated time
+
+        self._updates = []      # [owner, fn, last_time]
+        self._next_update = 0   # round-robin start
+        self._ready = deque()   # (owner, fn) to run as soon as there's budget
+        self._timers = []       # heap of (due, seq, owner, fn)
+        self._seq = itertools.count()
+
+        # owner -> ms spent in its callbacks, None = not measured. The
+        # profiler switches this on and collects it with take_times().
+        self.times = None
+
+    # -------------------------
+    # REGISTRATION
+    # -------------------------
+    def on_update(self, owner, fn):
+        """fn(dt) every tick. dt covers any ticks it was skipped for."""
+        self._updates.append([owner, fn, self.time])
+
+    def call_soon(self, owner, fn):
+        self._ready.append((owner, fn))
+
+    def after(self, owner, delay, fn):
+        heapq.heappush(self._timers, (self.time + delay, next(self._seq), owner, fn))
+
+    def every(self, owner, interval, fn):
+        def repeat():
+            fn()
+            self.after(owner, interval, repeat)
+        self.after(owner, interval, repeat)
+
+    def spawn(self, owner, coro):
+        """Run a generator; it yields seconds to wait (None/0 = next tick)."""
+        def resume():
+            try:
+                delay = next(coro)
+            except StopIteration:
+                return
+            self.after(owner, delay or 0.0, resume)
+        self.call_soon(owner, resume)
+
+    def clear(self, owner):
+        """Drop everything an owner (script) registered."""
+        self._updates = [u for u in self._updates if u[0] != owner]
+        self._ready = deque(r for r in self._ready if r[0] != owner)
+        self._timers = [t for t in self._timers if t[2] != owner]
+        heapq.heapify(self._timers)
+
+    # -------------------------
+    # TICK
+    # -------------------------
+    def step(self, dt, deadline=None):
+        self.time += dt
+        if deadline is None:
+            deadline = time.perf_counter() + self.budget_ms / 1000
+
+        # due timers join the ready queue (and only run from the next step)
+        timers = self._timers
+        while timers and timers[0][0] <= self.time:
+            _, _, owner, fn = heapq.heappop(timers)
+            self._ready.append((owner, fn))
+
+        # always let at least one callback run so nothing starves
+        updates = self._updates[:]
+        n = len(updates)
+        ran = 0
+        for i in range(n):
+            if ran and time.perf_counter() >= deadline:
+                break
+            entry = updates[(self._next_update + i) % n]
+            owner, fn, last = entry
+            entry[2] = self.time
+            if not self._run(owner, fn, self.time - last):
+                self._updates = [u for u in self._updates if u is not entry]
+            ran += 1
+        if n:
+            self._next_update = (self._next_update + ran) % n
+
+        ready = self._ready
+        while ready and not (ran and time.perf_counter() >= deadline):
+            owner, fn = ready.popleft()
+            self._run(owner, fn)
+            ran += 1
+
+    def take_times(self):
+        """ms per owner since the last call, and start counting afresh."""
+        times = self.times or {}
+        if self.times is not None:
+            self.times = {}
+        return times
+
+    def _run(self, owner, fn, *args):
+        times = self.times
+        t0 = time.perf_counter() if times is not None else 0.0
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Script error ({owner}):", e)
+            return False
+        finally:
+            if times is not None:
+                times[owner] = times.get(owner, 0.0) + (time.perf_counter() - t0) * 1000
+        return True
@@ -0,0 +1,389 @@
+import math
+from Engine.raycast import RayHit, cast_ray_grid, ray_box, stats
+
+
+# -------------------------
+# UNIFORM GRID
+# -------------------------
+class UniformGrid:
+    """Parts bucketed into square XZ cells. Good for maze-like scenes.
+
+    A part covering more than max_cells cells (a ground plane, a long
+    wall) goes in large instead, which every query and ray also tests,
+    so one huge part doesn't fill thousands of buckets.
+    """
+
+    def __init__(self, cell=4.0, max_cells=64):
+        self.cell = float(cell)
+        self.max_cells = max_cells
+        self.cells = {}    # (i, k) -> [parts]
+        self.large = []    # parts too big to bucket
+        self._spans = {}   # part -> (i0, k0, i1, k1)
+
+    def _span(self, b):
+        c = self.cell
+        return (
+            math.floor(b[0] / c), math.floor(b[2] / c),
+            math.floor(b[3] / c), math.floor(b[5] / c),
+        )
+
+    def _is_large(self, span):
+        i0, k0, i1, k1 = span
+        return (i1 - i0 + 1) * (k1 - k0 + 1) > self.max_cells
+
+    def insert(self, part):
+        span = self._span(part.bounds())
+        self._spans[part] = span
+        if self._is_large(span):
+            self.large.append(part)
+            return
+
+        i0, k0, i1, k1 = span
+        cells = self.cells
+        for i in range(i0, i1 + 1):
+            for k in range(k0, k1 + 1):
+                bucket = cells.get((i, k))
+                if bucket is None:
+                    cells[(i, k)] = [part]
+                else:
+                    bucket.append(part)
+
+    def insert_many(self, parts):
+        # insert() inlined: bulk adds (loaders, create.parts) are hot
+        c = self.cell
+        floor = math.floor
+        cells = self.cells
+        spans = self._spans
+        large = self.large
+        max_cells = self.max_cells
+        for part in parts:
+            b = part.bounds()
+            i0, k0 = floor(b[0] / c), floor(b[2] / c)
+            i1, k1 = floor(b[3] / c), floor(b[5] / c)
+            spans[part] = (i0, k0, i1, k1)
+            if i0 == i1 and k0 == k1:
+                bucket = cells.get((i0, k0))
+                if bucket is None:
+                    cells[(i0, k0)] = [part]
+                else:
+                    bucket.append(part)
+            elif (i1 - i0 + 1) * (k1 - k0 + 1) > max_cells:
+                large.append(part)
+            else:
+                for i in range(i0, i1 + 1):
+                    for k in range(k0, k1 + 1):
+                        bucket = cells.get((i, k))
+                        if bucket is None:
+                            cells[(i, k)] = [part]
+                        else:
+                            bucket.append(part)
+
+    def remove(self, part):
+        span = self._spans.pop(part, None)
+        if span is None:
+            return
+        if self._is_large(span):
+            self.large.remove(part)
+            return
+
+        i0, k0, i1, k1 = span
+        cells = self.cells
+        for i in range(i0, i1 + 1):
+            for k in range(k0, k1 + 1):
+                bucket = cells[(i, k)]
+                bucket.remove(part)
+                if not bucket:
+                    del cells[(i, k)]
+
+    def update(self, part):
+        if self._spans.get(part) == self._span(part.bounds()):
+            return
+        self.remove(part)
+        self.insert(part)
+
+    # candidates only - callers still do the exact test
+    def query_box(self, minx, miny, minz, maxx, maxy, maxz):
+        c = self.cell
+        cells = self.cells
+        i0, i1 = math.floor(minx / c), math.floor(maxx / c)
+        k0, k1 = math.floor(minz / c), math.floor(maxz / c)
+
+        # big boxes: walk the occupied cells instead of the whole range
+        if (i1 - i0 + 1) * (k1 - k0 + 1) > len(cells):
+            buckets = [b for (i, k), b in cells.items()
+                       if i0 <= i <= i1 and k0 <= k <= k1]
+        else:
+            buckets = [cells[(i, k)]
+                       for i in range(i0, i1 + 1)
+                       for k in range(k0, k1 + 1)
+                       if (i, k) in cells]
+
+        seen = set()
+        out = []
+        for bucket in buckets:
+            for part in bucket:
+                if part not in seen:
+                    seen.add(part)
+                    out.append(part)
+        for part in self.large:
+            b = part.bounds()
+            if b[0] <= maxx and b[3] >= minx and b[2] <= maxz and b[5] >= minz:
+                out.append(part)
+        return out
+
+    def raycast(self, origin, angle, max_dist=15.0):
+        return cast_ray_grid(origin, angle, self, max_dist)
+
+
+# -------------------------
+# BVH (dynamic AABB tree)
+# -------------------------
+class _Node:
+    __slots__ = ("box", "part", "parent", "left", "right")
+
+    def __init__(self, box, part=None):
+        self.box = box
+        self.part = part      # set on leaves only
+        self.parent = None
+        self.left = None
+        self.right = None
+
+
+def _union(a, b):
+    return (
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] < b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+        a[4] if a[4] > b[4] else b[4],
+        a[5] if a[5] > b[5] else b[5],
+    )
+
+
+def _area(b):
+    # half surface area, enough for comparing insertion costs
+    x = b[3] - b[0]
+    y = b[4] - b[1]
+    z = b[5] - b[2]
+    return x * y + y * z + z * x
+
+
+class BVH:
+    """Bounding volume hierarchy over part boxes. Good for arbitrary scenes.
+
+    Inserts pick the sibling with the lowest surface-area cost, so the tree
+    stays usable when parts are added one at a time by loaders and scripts.
+    """
+
+    def __init__(self):
+        self.root = None
+        self._leaves = {}   # part -> leaf node
+
+    def insert(self, part):
+        leaf = _Node(part.bounds(), part)
+        self._leaves[part] = leaf
+        self._insert_leaf(leaf)
+
+    def insert_many(self, parts):
+        # build top-down, much better than n inserts: a batch at least as
+        # big as the tree rebuilds it whole, a smaller one goes in as one
+        # subtree
+        if len(parts) < 16:
+            for part in parts:
+                self.insert(part)
+            return
+
+        leaves = []
+        for part in parts:
+            leaf = _Node(part.bounds(), part)
+            self._leaves[part] = leaf
+            leaves.append(leaf)
+
+        if len(leaves) * 2 >= len(self._leaves):
+            leaves = list(self._leaves.values())
+            for leaf in leaves:
+                leaf.parent = None
+            self.root = self._build(leaves)
+        else:
+            self._insert_leaf(self._build(leaves))
+
+    def remove(self, part):
+        leaf = self._leaves.pop(part, None)
+        if leaf is not None:
+            self._remove_leaf(leaf)
+
+    def update(self, part):
+        leaf = self._leaves.get(part)
+        if leaf is None:
+            self.insert(part)
+            return
+
+        box = part.bounds()
+        if box == leaf.box:
+            return
+        self._remove_leaf(leaf)
+        leaf.box = box
+        self._insert_leaf(leaf)
+
+    def query_box(self, minx, miny, minz, maxx, maxy, maxz):
+        out = []
+        if self.root is None:
+            return out
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            b = node.box
+            if (b[0] > maxx or b[3] < minx or
+                    b[1] > maxy or b[4] < miny or
+                    b[2] > maxz or b[5] < minz):
+                continue
+            if node.part is not None:
+                out.append(node.part)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        return out
+
+    def raycast(self, origin, angle, max_dist=15.0):
+        ox, oy, oz = origin.x, origin.y, origin.z
+        dx = math.cos(angle)
+        dz = math.sin(angle)
+
+        best_t = max_dist
+        best_part = None
+        best_nx = best_nz = 0.0
+
+        stats.rays += 1
+        if self.root is None:
+            return None
+
+        # steps = nodes visited, tests = the leaves among them (part boxes)
+        stack = [self.root]
+        steps = 0
+        tests = 0
+        while stack:
+            node = stack.pop()
+            steps += 1
+            part = node.part
+            if part is not None:
+                tests += 1
+            hit = ray_box(ox, oy, oz, dx, dz, *node.box, best_t)
+            if hit is None:
+                continue
+
+            if part is None:
+                stack.append(node.left)
+                stack.append(node.right)
+            elif part.collidable and (best_part is None or hit[0] < best_t):
+                best_t = hit[0]
+                best_part = part
+                best_nx, best_nz = hit[1], hit[2]
+
+        stats.steps += steps
+        stats.tests += tests
+        if best_part is None:
+            return None
+        return RayHit(best_t, best_part, ox, oy, oz, dx, dz, best_nx, best_nz)
+
+    # -------------------------
+    # TREE MAINTENANCE
+    # -------------------------
+    def _build(self, leaves):
+        if len(leaves) == 1:
+            return leaves[0]
+
+        # median split on the axis where the box centres spread the most
+        spread = []
+        for a in range(3):
+            centres = [l.box[a] + l.box[a + 3] for l in leaves]
+            spread.append(max(centres) - min(centres))
+        axis = spread.index(max(spread))
+        leaves.sort(key=lambda l: l.box[axis] + l.box[axis + 3])
+
+        mid = len(leaves) // 2
+        node = _Node(None)
+        node.left = self._build(leaves[:mid])
+        node.right = self._build(leaves[mid:])
+        node.left.parent = node
+        node.right.parent = node
+        node.box = _union(node.left.box, node.right.box)
+        return node
+
+    def _insert_leaf(self, leaf):
+        leaf.parent = None
+        if self.root is None:
+            self.root = leaf
+            return
+
+        box = leaf.box
+        node = self.root
+        while node.part is None:
+            combined = _area(_union(node.box, box))
+            cost_here = 2.0 * combined
+            inherited = 2.0 * (combined - _area(node.box))
+
+            cost_l = self._descend_cost(node.left, box) + inherited
+            cost_r = self._descend_cost(node.right, box) + inherited
+
+            if cost_here < cost_l and cost_here < cost_r:
+                break
+            node = node.left if cost_l < cost_r else node.right
+
+        sibling = node
+        old_parent = sibling.parent
+
+        parent = _Node(_union(sibling.box, box))
+        parent.parent = old_parent
+        parent.left = sibling
+        parent.right = leaf
+        sibling.parent = parent
+        leaf.parent = parent
+
+        if old_parent is None:
+            self.root = parent
+        elif old_parent.left is sibling:
+            old_parent.left = parent
+        else:
+            old_parent.right = parent
+
+        self._refit(old_parent)
+
+    def _descend_cost(self, node, box):
+        grown = _area(_union(node.box, box))
+        if node.part is not None:
+            return grown
+        return grown - _area(node.box)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self.root:
+            self.root = None
+            return
+
+        parent = leaf.parent
+        grand = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grand is None:
+            self.root = sibling
+            sibling.parent = None
+        else:
+            if grand.left is parent:
+                grand.left = sibling
+            else:
+                grand.right = sibling
+            sibling.parent = grand
+            self._refit(grand)
+
+        leaf.parent = None
+
+    def _refit(self, node):
+        while node is not None:
+            node.box = _union(node.left.box, node.right.box)
+            node = node.parent
+
+
+INDEX_TYPES = {
+    "grid": UniformGrid,
+    "bvh": BVH,
+}
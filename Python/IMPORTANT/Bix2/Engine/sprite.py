@@ -0,0 +1,22 @@
+from Engine.math3d import Vec3
+
+
+class Sprite:
+    """A billboard entity (item, NPC): a flat picture that always faces
+    the camera.
+
+    pos is its centre and size its (width, height) in world units. The
+    renderer draws sprites over the walls, clipped by each column's wall
+    distance; rays and the player pass straight through them. After
+    changing one that is in a World, call World.update_sprite.
+    """
+    __slots__ = ("pos", "size", "color", "texture")
+
+    def __init__(self, pos: Vec3, size=(1.0, 1.0), color=(255, 255, 255), texture=None):
+        self.pos = pos
+        self.size = (float(size[0]), float(size[1]))
+        self.color = tuple(color)
+        self.texture = texture   # image path, or None for a flat colour
+
+    def __repr__(self):
+        return f"Sprite(pos={self.pos}, size={self.size}, color={self.color})"
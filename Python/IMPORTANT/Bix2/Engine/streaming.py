@@ -0,0 +1,114 @@
+import queue
+import threading
+
+from Engine.loader import chunk_of, list_chunks, read_pack
+
+
+class ChunkStreamer:
+    """Keeps the chunks around the player loaded, and only those.
+
+    A chunked workspace (loader.pack_chunks) is a folder of small packs,
+    one per square of the XZ plane. A background thread reads the packs
+    and builds their parts; update() then adds finished chunks to the
+    World on the engine thread, since the World's store and index are not
+    safe to change mid-frame. Unloaded chunks are simply removed, so only
+    resident parts take part in raycasts and collision.
+
+    radius is in chunks. Chunks are dropped only once they are a chunk
+    further out than that, so walking along a border doesn't thrash.
+    """
+
+    def __init__(self, world, size, files, radius=2, apply_per_frame=2):
+        self.world = world
+        self.size = size
+        self.files = files           # (i, k) -> pack path
+        self.radius = radius
+        self.apply_per_frame = apply_per_frame   # chunks added per update
+        self.sync = False            # True: update() waits for its chunks
+
+        self.resident = {}           # (i, k) -> [parts]
+        self._pending = set()        # requested, not yet applied
+        self._requests = queue.Queue()
+        self._done = queue.Queue()
+        self._thread = threading.Thread(target=self._work, name="bix-chunks", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, world, path, **kwargs):
+        """A streamer for the workspace folder path, None if it isn't chunked."""
+        found = list_chunks(path)
+        if found is None:
+            return None
+        size, files = found
+        return cls(world, size, files, **kwargs)
+
+    # -------------------------
+    # ENGINE THREAD
+    # -------------------------
+    def update(self, pos):
+        """Request chunks that came into range, apply loaded ones, drop far ones."""
+        ci, ck = chunk_of(pos.x, pos.z, self.size)
+        r = self.radius
+        wanted = {
+            (i, k)
+            for i in range(ci - r, ci + r + 1)
+            for k in range(ck - r, ck + r + 1)
+            if (i, k) in self.files
+        }
+
+        for key in wanted - self.resident.keys() - self._pending:
+            self._pending.add(key)
+            self._requests.put((key, self.files[key]))
+
+        if self.sync:
+            self._wait()
+        for _ in range(self.apply_per_frame):
+            try:
+                key, parts = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            # the player may have moved on while it loaded
+            if key in wanted and key not in self.resident:
+                self.world.add_parts(parts)
+                self.resident[key] = parts
+
+        far = [
+            key for key in self.resident
+            if max(abs(key[0] - ci), abs(key[1] - ck)) > r + 1
+        ]
+        for key in far:
+            self.world.remove_parts(self.resident.pop(key))
+
+    def load_now(self, pos):
+        """Load everything in range before returning, e.g. before the first frame."""
+        self.update(pos)
+        self._wait()
+
+    def _wait(self):
+        while self._pending:
+            key, parts = self._done.get()
+            self._pending.discard(key)
+            if key not in self.resident:
+                self.world.add_parts(parts)
+                self.resident[key] = parts
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join(timeout=1.0)
+
+    # -------------------------
+    # LOADER THREAD
+    # -------------------------
+    def _work(self):
+        while True:
+            job = self._requests.get()
+            if job is None:
+                return
+            key, path = job
+            try:
+                parts = read_pack(path)
+            except (OSError, ValueError) as e:
+                print(f"[Loader] Chunk {key}: {e}")
+                parts = []
+            self._done.put((key, parts))
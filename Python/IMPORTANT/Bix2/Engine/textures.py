@@ -0,0 +1,50 @@
+import numpy as np
+import pygame
+
+TEX_SIZE = 64   # every texture is scaled to TEX_SIZE x TEX_SIZE
+
+
+class TextureBank:
+    """Images for the numpy renderer, loaded once per path.
+
+    All textures share one size so they sit in a single (n, TEX_SIZE,
+    TEX_SIZE) array of screen-mapped pixels, indexed [id, x, y], and a
+    whole band's texels come out of one fancy index. opaque is the same
+    shape, False where the image is transparent (alpha or colorkey);
+    walls ignore it, sprites are cut out by it.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.pixels = None
+        self.opaque = None
+        self._images = []
+        self._masks = []
+        self._ids = {}
+
+    def load(self, path):
+        """Texture id for an image path, -1 if it can't be loaded."""
+        tid = self._ids.get(path)
+        if tid is not None:
+            return tid
+
+        try:
+            image = pygame.image.load(path)
+        except (pygame.error, OSError) as e:
+            print(f"[Renderer] Texture {path}: {e}")
+            tid = -1
+        else:
+            image = pygame.transform.scale(image, (TEX_SIZE, TEX_SIZE))
+            rgb = pygame.surfarray.array3d(image)
+            self._images.append(pygame.surfarray.map_array(self.screen, rgb))
+            self.pixels = np.stack(self._images)
+
+            opaque = pygame.surfarray.array_alpha(image) > 127
+            if image.get_colorkey() is not None:
+                opaque &= pygame.surfarray.array_colorkey(image) > 127
+            self._masks.append(opaque)
+            self.opaque = np.stack(self._masks)
+            tid = len(self._images) - 1
+
+        self._ids[path] = tid
+        return tid
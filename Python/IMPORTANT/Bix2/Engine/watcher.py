@@ -0,0 +1,241 @@
+import os
+import queue
+import threading
+
+from Engine.loader import PACK_NAME, compile_script, load_part_file, pack_workspace, read_pack
+
+
+class Watcher:
+    """Watches Workspace and ScriptService and applies only what changed.
+
+    An edited .part file updates its loaded Part in place, a new one adds a
+    part and a deleted one removes it. An edited workspace pack is diffed
+    part by part; while there is one, .part edits rebuild it and apply
+    that diff. An edited .bix script has the parts it made removed and is
+    run again.
+
+    The folders are scanned on a background thread, which posts what
+    changed; poll() applies it on the engine thread. Chunks shadow the
+    whole workspace, so with a streamer it isn't scanned at all.
+    """
+
+    def __init__(self, engine, workspace, scripts, sources, interval=0.5):
+        self.engine = engine
+        self.workspace = workspace
+        self.scripts = scripts
+        self.interval = interval  # seconds between folder scans
+
+        self._sources = dict(sources)  # workspace file -> [parts]
+        self._pack = os.path.join(workspace, PACK_NAME)
+        self._lock = threading.Lock()
+        self._mtimes = self._scan()    # path -> mtime, None to retry
+        self._changes = queue.Queue()  # ([changed paths], [deleted paths])
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._work, name="bix-watch", daemon=True)
+        self._thread.start()
+
+    # -------------------------
+    # ENGINE THREAD
+    # -------------------------
+    def poll(self):
+        """Apply every change the scanner has found since the last poll."""
+        while True:
+            try:
+                changed, deleted = self._changes.get_nowait()
+            except queue.Empty:
+                return
+            # a pack is rebuilt from its .part files once per batch, however
+            # many of them changed
+            packed = os.path.isfile(self._pack)
+            stale = [p for p in changed + deleted if packed and p.endswith(".part")]
+
+            # deletions first: a deleted pack brings its .part files back
+            for path in deleted:
+                if path not in stale:
+                    self._deleted(path)
+            for path in changed:
+                if path not in stale and not self._changed(path):
+                    self._retry(path)  # half-written file, retry next scan
+            if stale:
+                self._repack(stale)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    # -------------------------
+    # SCANNER
+    # -------------------------
+    def scan(self):
+        """Compare the folders with the last scan and post what changed.
+
+        Runs every interval on the watcher thread; call it directly to
+        pick up changes without waiting.
+        """
+        with self._lock:
+            old = self._mtimes
+            new = self._scan()
+            watched = self._workspace_exts() + (".bix",)
+            changed = [path for path, mtime in new.items() if old.get(path) != mtime]
+            # files that merely stopped being watched weren't deleted
+            deleted = [path for path in old.keys() - new.keys() if path.endswith(watched)]
+            self._mtimes = new
+        if changed or deleted:
+            self._changes.put((changed, deleted))
+
+    def _work(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.scan()
+            except OSError as e:
+                print(f"[Reload] Scan failed: {e}")
+
+    def _retry(self, path):
+        with self._lock:
+            if path in self._mtimes:
+                self._mtimes[path] = None
+
+    def _workspace_exts(self):
+        # chunks replace the pack and the .part files, so don't stat what
+        # can't be applied
+        if self.engine.streamer is not None:
+            return ()
+        return (".part", ".bixpack")
+
+    # -------------------------
+    # INTERNALS
+    # -------------------------
+    def _scan(self):
+        mtimes = {}
+        for folder, exts in ((self.workspace, self._workspace_exts()), (self.scripts, (".bix",))):
+            if not exts or not os.path.isdir(folder):
+                continue
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.endswith(exts):
+                        try:
+                            mtimes[entry.path] = entry.stat().st_mtime_ns
+                        except OSError:
+                            pass
+        return mtimes
+
+    def _changed(self, path):
+        try:
+            if path.endswith(".bix"):
+                self._rerun_script(path, compile_script(path))
+            elif self.engine.streamer is not None:
+                print(f"[Reload] {os.path.basename(path)} is shadowed by chunks, not applied")
+                return True
+            elif path == self._pack:
+                self._diff_pack(read_pack(path))
+            elif os.path.isfile(self._pack):
+                return self._repack([path])
+            else:
+                self._apply_part_file(path, load_part_file(path, self.engine.world.origin))
+        except SyntaxError as e:
+            # keep the old version running until the script is fixed
+            print("Script error:", e)
+            return True
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            print(f"[Reload] Skipped {os.path.basename(path)}: {e}")
+            return False
+
+        print(f"[Reload] {os.path.basename(path)}")
+        return True
+
+    def _deleted(self, path):
+        world = self.engine.world
+
+        if path.endswith(".bix"):
+            world.remove_parts(world.script_parts.pop(path, []))
+            world.remove_sprites(world.script_sprites.pop(path, []))
+            self.engine.scheduler.clear(path)
+            world.scripts = [(n, c) for n, c in world.scripts if n != path]
+        elif path == self._pack:
+            # back to the loose .part files
+            self._diff_pack([])
+            with self._lock:
+                loose = [p for p in self._mtimes if p.endswith(".part")]
+            for filepath in loose:
+                if not self._changed(filepath):
+                    self._retry(filepath)
+        else:
+            world.remove_parts(self._sources.pop(path, []))
+
+        print(f"[Reload] removed {os.path.basename(path)}")
+
+    def _repack(self, paths):
+        """Rebuild the pack after its .part files changed and apply the diff."""
+        try:
+            pack_workspace(self.workspace)
+            parts = read_pack(self._pack)
+            mtime = os.stat(self._pack).st_mtime_ns
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            print(f"[Reload] Skipped repacking {PACK_NAME}: {e}")
+            for path in paths:
+                self._retry(path)
+            return False
+
+        self._diff_pack(parts)
+        # the scanner would otherwise post the new pack as another change
+        with self._lock:
+            self._mtimes[self._pack] = mtime
+        names = ", ".join(os.path.basename(p) for p in paths[:3])
+        more = f" and {len(paths) - 3} more" if len(paths) > 3 else ""
+        print(f"[Reload] {names}{more} (repacked {PACK_NAME})")
+        return True
+
+    def _apply_part_file(self, path, new):
+        old = self._sources.get(path)
+        if old:
+            self._copy_part(old[0], new)
+        else:
+            self.engine.world.add_part(new)
+            self._sources[path] = [new]
+
+    def _diff_pack(self, new_parts):
+        world = self.engine.world
+
+        # a pack replaces any loose .part files that were loaded
+        for path in [p for p in self._sources if p != self._pack]:
+            world.remove_parts(self._sources.pop(path))
+
+        old_parts = self._sources.get(self._pack, [])
+        keep = min(len(old_parts), len(new_parts))
+        for old, new in zip(old_parts[:keep], new_parts[:keep]):
+            self._copy_part(old, new)
+
+        world.remove_parts(old_parts[keep:])
+        world.add_parts(new_parts[keep:])
+        self._sources[self._pack] = old_parts[:keep] + new_parts[keep:]
+
+    def _copy_part(self, old, new):
+        same = (
+            old.bounds() == new.bounds() and
+            old.collidable == new.collidable and
+            old.color == new.color and
+            old.texture == new.texture
+        )
+        if same:
+            return
+
+        old.set_bounds(*new.bounds())
+        old.collidable = new.collidable
+        old.color = new.color
+        old.texture = new.texture
+        self.engine.world.update_part(old)
+
+    def _rerun_script(self, path, code):
+        world = self.engine.world
+        world.remove_parts(world.script_parts.pop(path, []))
+        world.remove_sprites(world.script_sprites.pop(path, []))
+
+        # keep World.scripts in sync so a full run_scripts sees the new code
+        for i, (name, _) in enumerate(world.scripts):
+            if name == path:
+                world.scripts[i] = (path, code)
+                break
+        else:
+            world.scripts.append((path, code))
+
+        world.run_script(self.engine, path, code)
@@ -1,16 +1,27 @@
 from Engine.math3d import Vec3
-from Engine.part import Part
+from Engine.part import Part, PartStore
+from Engine.sprite import Sprite
+from Engine.spatial import INDEX_TYPES
+from array import array
+from collections import deque
+import math
 import os
 import sys
 
+try:
+    import numpy as np
+except ImportError:  # create.parts takes plain sequences without it
+    np = None
+
 class Player:
-    __slots__ = ("pos", "yaw", "speed", "rot_speed")
+    __slots__ = ("pos", "yaw", "speed", "rot_speed", "radius")
 
     def __init__(self):
         self.pos = Vec3(0, 2, 0)
         self.yaw = 0.0
         self.speed = 5.0
         self.rot_speed = 2.5
+        self.radius = 0.25  # half width of the player's collision box
 
 
 def hex_to_rgb(hex_str):
@@ -23,18 +34,29 @@ def hex_to_rgb(hex_str):
 # -------------------------
 
 class ScriptPart:
-    def __init__(self, engine, name):
+    def __init__(self, engine, name, part=None):
         self._engine = engine
-        self._part = Part(Vec3(0, 0, 0), Vec3(1, 1, 1), True)
-        self._engine.world.add_part(self._part)
+        if part is None:
+            part = Part(Vec3(0, 0, 0), Vec3(1, 1, 1), True)
+            engine.world.add_part(part)
+        self._part = part
+
+    # pos follows the workspace origin: the centre, or the min corner
 
     @property
     def pos(self):
-        return (self._part.pos.x, self._part.pos.y, self._part.pos.z)
+        b = self._part.bounds()
+        if self._engine.world.origin == "corner":
+            return (b[0], b[1], b[2])
+        return ((b[0] + b[3]) / 2, (b[1] + b[4]) / 2, (b[2] + b[5]) / 2)
 
     @pos.setter
     def pos(self, value):
-        self._part.pos = Vec3(*value)
+        if self._engine.world.origin == "corner":
+            self._part.corner = Vec3(*value)
+        else:
+            self._part.pos = Vec3(*value)
+        self._engine.world.update_part(self._part)
 
     @property
     def size(self):
@@ -42,7 +64,8 @@ class ScriptPart:
 
     @size.setter
     def size(self, value):
-        self._part.size = Vec3(*value)
+        self._part.resize(Vec3(*value), self._engine.world.origin)
+        self._engine.world.update_part(self._part)
 
     @property
     def CanCollide(self):
@@ -51,6 +74,7 @@ class ScriptPart:
     @CanCollide.setter
     def CanCollide(self, value):
         self._part.collidable = bool(value)
+        self._engine.world.update_part(self._part)
 
     @property
     def Colour(self):
@@ -59,14 +83,222 @@ class ScriptPart:
     @Colour.setter
     def Colour(self, hex_str):
         self._part.color = hex_to_rgb(hex_str)
+        self._engine.world.update_part(self._part)
+
+
+class PartGroup:
+    """The parts made by one create.parts call.
+
+    Indexing gives a ScriptPart handle, made on first use, so a script that
+    never touches its walls again never pays for the handles.
+    """
+
+    def __init__(self, engine, parts):
+        self._engine = engine
+        self._parts = parts
+        self._handles = {}
+
+    def __len__(self):
+        return len(self._parts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self._parts)))]
+        if i < 0:
+            i += len(self._parts)
+        handle = self._handles.get(i)
+        if handle is None:
+            handle = ScriptPart(self._engine, None, self._parts[i])
+            self._handles[i] = handle
+        return handle
+
+    def __iter__(self):
+        for i in range(len(self._parts)):
+            yield self[i]
+
+
+class ScriptSprite:
+    def __init__(self, engine, sprite):
+        self._engine = engine
+        self._sprite = sprite
+
+    @property
+    def pos(self):
+        p = self._sprite.pos
+        return (p.x, p.y, p.z)
+
+    @pos.setter
+    def pos(self, value):
+        self._sprite.pos.set(*value)
+        self._engine.world.update_sprite(self._sprite)
+
+    @property
+    def size(self):
+        return self._sprite.size
+
+    @size.setter
+    def size(self, value):
+        self._sprite.size = (float(value[0]), float(value[1]))
+        self._engine.world.update_sprite(self._sprite)
+
+    @property
+    def Colour(self):
+        return self._sprite.color
+
+    @Colour.setter
+    def Colour(self, hex_str):
+        self._sprite.color = hex_to_rgb(hex_str)
+        self._engine.world.update_sprite(self._sprite)
+
+    def destroy(self):
+        self._engine.world.remove_sprites([self._sprite])
+
+
+class ScriptHit:
+    """A RayHit as scripts see it.
+
+    part is a ScriptPart handle, so changing the hit part goes through
+    World.update_part like any other script edit. point, normal and u are
+    the engine hit's, built on first access.
+    """
+
+    def __init__(self, engine, hit):
+        self._hit = hit
+        self.distance = hit.distance
+        self.part = ScriptPart(engine, None, hit.part)
+
+    @property
+    def point(self):
+        return self._hit.point
+
+    @property
+    def normal(self):
+        return self._hit.normal
+
+    @property
+    def u(self):
+        return self._hit.u
+
+    def __repr__(self):
+        return f"ScriptHit(distance={self.distance}, pos={self.part.pos}, normal={self.normal})"
 
 
 class CreateAPI:
-    def __init__(self, engine):
+    def __init__(self, engine, folder=None):
         self.engine = engine
+        self.folder = folder      # texture paths are relative to the script
+        self.created = []         # parts made by this script, for hot reload
+        self.created_sprites = []
 
     def part(self, name):
-        return ScriptPart(self.engine, name)
+        p = ScriptPart(self.engine, name)
+        self.created.append(p._part)
+        return p
+
+    def sprite(self, pos, size=(1, 1), colour="#FFFFFF", texture=None):
+        """A billboard at pos (its centre), size = (width, height).
+
+        texture is an image path relative to the script; its transparent
+        pixels show what's behind. Sprites are drawn, never collided with.
+        """
+        if texture is not None and self.folder is not None:
+            texture = os.path.normpath(os.path.join(os.path.abspath(self.folder), texture))
+        colour = hex_to_rgb(colour) if isinstance(colour, str) else colour
+        sprite = Sprite(Vec3(*pos), size, colour, texture)
+        self.engine.world.add_sprite(sprite)
+        self.created_sprites.append(sprite)
+        return ScriptSprite(self.engine, sprite)
+
+    def parts(self, positions, sizes=(1, 1, 1), colours=(200, 200, 200), collidable=True):
+        """Make many parts at once from sequences or NumPy arrays.
+
+        positions is one (x, y, z) per part, read with the workspace
+        origin (centre or min corner). sizes, colours ("#RRGGBB" or
+        (r, g, b)) and collidable take either one value for every part or
+        one per part. The world and its index are updated in one go.
+        """
+        corner = self.engine.world.origin == "corner"
+        n = len(positions)
+        columns = _box_columns(positions, sizes, n, corner)
+
+        colours = _colours(colours)
+        if _is_single(colours):
+            colour_bytes = bytes(colours) * n
+        else:
+            colour_bytes = bytes(c for rgb in _per_part(colours, n) for c in rgb)
+
+        collidable = _rows(collidable)
+        if not isinstance(collidable, (list, tuple)):
+            solid = bytes([1 if collidable else 0]) * n
+        elif len(collidable) != n:
+            raise ValueError(f"expected {n} collidable flags, got {len(collidable)}")
+        else:
+            solid = bytes(1 if c else 0 for c in collidable)
+
+        # straight into the store's columns, no Part built per row first
+        parts = self.engine.world.add_columns(*columns, colour_bytes, solid)
+        self.created.extend(parts)
+        return PartGroup(self.engine, parts)
+
+
+class RaycastAPI:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def cast(self, origin, angle, max_dist=15.0):
+        """Ray from an (x, y, z) tuple. Returns a ScriptHit or None."""
+        return self._wrap(self.engine.world.raycast(Vec3(*origin), angle, max_dist))
+
+    def look(self, max_dist=15.0):
+        """Ray straight ahead of the player."""
+        p = self.engine.world.player
+        return self._wrap(self.engine.world.raycast(p.pos, p.yaw, max_dist))
+
+    def _wrap(self, hit):
+        return ScriptHit(self.engine, hit) if hit is not None else None
+
+
+class ScheduleAPI:
+    def __init__(self, engine, owner):
+        self._scheduler = engine.scheduler
+        self._owner = owner
+
+    def after(self, seconds, fn):
+        """Call fn() once, seconds from now."""
+        self._scheduler.after(self._owner, seconds, fn)
+
+    def every(self, seconds, fn):
+        """Call fn() every few seconds."""
+        self._scheduler.every(self._owner, seconds, fn)
+
+    def spawn(self, coro):
+        """Run a generator that yields seconds to wait between steps."""
+        if callable(coro):
+            coro = coro()
+        self._scheduler.spawn(self._owner, coro)
+
+
+class InputAPI:
+    """Action queries for scripts, e.g. input.pressed("jump") in on_update."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def down(self, action):
+        """True while a key bound to action is held."""
+        return self.engine.input.down(action)
+
+    def pressed(self, action):
+        """True on the tick action went down."""
+        return self.engine.input.pressed(action)
+
+    def released(self, action):
+        """True on the tick action went up."""
+        return self.engine.input.released(action)
+
+    def bind(self, action, *keys):
+        """Bind key names ("space", "e") to an action."""
+        self.engine.input.bind(action, *keys)
 
 
 class DebugAPI:
@@ -82,55 +314,326 @@ class DebugAPI:
             )
 
 
+def _box_columns(positions, sizes, n, corner):
+    """minx, miny, minz, maxx, maxy, maxz columns for create.parts."""
+    if np is not None and hasattr(positions, "shape"):
+        # NumPy in, NumPy math: no per-row Python at all
+        pos = np.asarray(positions, dtype=np.float64).reshape(n, 3)
+        size = np.asarray(sizes, dtype=np.float64)
+        if size.ndim == 2 and len(size) != n:
+            raise ValueError(f"expected {n} values, got {len(size)}")
+        size = np.broadcast_to(size, (n, 3))
+        lo = pos if corner else pos - size / 2
+        hi = lo + size
+        return [array("f", col.astype(np.float32).tobytes())
+                for col in (*lo.T, *hi.T)]
+
+    positions = _rows(positions)
+    if n == 0:
+        return [()] * 6
+    xs, ys, zs = zip(*positions)
+    sxs, sys_, szs = zip(*_per_part(_rows(sizes), n))
+    if corner:
+        lo = (xs, ys, zs)
+        hi = ([x + s for x, s in zip(xs, sxs)],
+              [y + s for y, s in zip(ys, sys_)],
+              [z + s for z, s in zip(zs, szs)])
+    else:
+        lo = ([x - s / 2 for x, s in zip(xs, sxs)],
+              [y - s / 2 for y, s in zip(ys, sys_)],
+              [z - s / 2 for z, s in zip(zs, szs)])
+        hi = ([x + s / 2 for x, s in zip(xs, sxs)],
+              [y + s / 2 for y, s in zip(ys, sys_)],
+              [z + s / 2 for z, s in zip(zs, szs)])
+    return [*lo, *hi]
+
+
+def _rows(values):
+    # NumPy arrays -> nested lists of plain floats, much faster to unpack
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    return values
+
+
+def _is_single(value):
+    # a scalar, or one (x, y, z) / (r, g, b) row
+    if not isinstance(value, (list, tuple)):
+        return True
+    return len(value) > 0 and isinstance(value[0], (int, float)) and not isinstance(value[0], bool)
+
+
+def _colours(values):
+    values = _rows(values)
+    if isinstance(values, str):
+        return hex_to_rgb(values)
+    if _is_single(values):
+        return tuple(int(c) for c in values)
+    return [hex_to_rgb(c) if isinstance(c, str) else tuple(int(v) for v in c) for c in values]
+
+
+def _per_part(value, n):
+    """One value for every part, or a per-part list of exactly n values."""
+    if _is_single(value):
+        return [value] * n
+    if len(value) != n:
+        raise ValueError(f"expected {n} values, got {len(value)}")
+    return value
+
+
 # -------------------------
 # WORLD
 # -------------------------
 
 class World:
-    def __init__(self):
+    def __init__(self, index="grid"):
         self.parts = []
-        self.scripts = []
+        self.store = PartStore()   # columnar data behind every Part in parts
+        self.scripts = []        # (name, code)
+        self.script_parts = {}   # name -> parts the script created
+        self.script_sprites = {} # name -> sprites the script created
         self.player = Player()
 
+        # billboard entities, drawn over the walls; never hit or collided with
+        self.sprites = []
+        self.sprite_version = 0   # bumped on every sprite change
+
+        # what a part's pos means in files and scripts: "centre" or "corner",
+        # set from the workspace's workspace.cfg
+        self.origin = "centre"
+
+        # (r, g, b), an image path, or None to leave the background showing
+        self.floor = None
+        self.ceiling = None
+
+        # bumped on every part change, lets renderers cache derived data
+        self.version = 0
+
+        # recent changes as (version, store rows touched), None for "too many
+        # to list", so a renderer can redo only what a change could affect
+        self.changes = deque(maxlen=64)
+
+        # spatial index over parts: "grid" for mazes, "bvh" for anything else
+        self.index = INDEX_TYPES[index]()
+
+        # running total of boxes the player's moves were checked against
+        self.collision_tests = 0
+
+    def set_index(self, index):
+        """Switch the spatial index ("grid" or "bvh"), keeping every part."""
+        if isinstance(self.index, INDEX_TYPES[index]):
+            return
+        self.index = INDEX_TYPES[index]()
+        self.index.insert_many(self.parts)
+
     def add_part(self, part):
+        self.store.add(part)
         self.parts.append(part)
-
-    def add_script(self, code):
-        self.scripts.append(code)
+        self.index.insert(part)
+        self._changed([part._row])
+
+    def add_parts(self, parts):
+        # bulk add: one store append, one index pass and one version bump
+        self.store.add_many(parts)
+        self.parts.extend(parts)
+        self.index.insert_many(parts)
+        self._changed([p._row for p in parts])
+
+    def add_columns(self, minx, miny, minz, maxx, maxy, maxz, color, collidable):
+        """Bulk add from column data (see PartStore.add_columns). Returns the new parts."""
+        parts = self.store.add_columns(minx, miny, minz, maxx, maxy, maxz, color, collidable)
+        self.parts.extend(parts)
+        self.index.insert_many(parts)
+        self._changed([p._row for p in parts])
+        return parts
+
+    def remove_part(self, part):
+        row = part._row
+        self.parts.remove(part)
+        self.index.remove(part)
+        self.store.remove(part)
+        self._changed([row])
+
+    def remove_parts(self, parts):
+        gone = set(parts)
+        if not gone:
+            return
+        rows = [p._row for p in gone]
+        self.parts = [p for p in self.parts if p not in gone]
+        for part in gone:
+            self.index.remove(part)
+            self.store.remove(part)
+        self._changed(rows)
+
+    def update_part(self, part):
+        # call after changing any property of a part
+        self.index.update(part)
+        self._changed([part._row])
+
+    def add_sprite(self, sprite):
+        self.sprites.append(sprite)
+        self.sprite_version += 1
+
+    def add_sprites(self, sprites):
+        self.sprites.extend(sprites)
+        self.sprite_version += 1
+
+    def remove_sprites(self, sprites):
+        gone = set(sprites)
+        if not gone:
+            return
+        self.sprites = [s for s in self.sprites if s not in gone]
+        self.sprite_version += 1
+
+    def update_sprite(self, sprite):
+        # call after changing any property of a sprite
+        self.sprite_version += 1
+
+    def changed_since(self, version):
+        """Store rows changed after version, or None if the log can't tell."""
+        if version >= self.version:
+            return set()
+        log = self.changes
+        if not log or log[0][0] > version + 1:
+            return None  # older changes already fell off the log
+        rows = set()
+        for v, changed in log:
+            if v > version:
+                if changed is None:
+                    return None
+                rows.update(changed)
+        return rows
+
+    def _changed(self, rows):
+        self.version += 1
+        self.changes.append((self.version, rows if len(rows) <= 256 else None))
+
+    def raycast(self, origin, angle, max_dist=15.0):
+        # nearest RayHit within max_dist, or None
+        return self.index.raycast(origin, angle, max_dist)
+
+    def add_script(self, code, name=None):
+        self.scripts.append((name, code))
 
     def run_scripts(self, engine):
+        for name, code in self.scripts:
+            self.run_script(engine, name, code)
+
+    def run_script(self, engine, name, code):
         engine_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         if engine_root not in sys.path:
             sys.path.insert(0, engine_root)
 
-        for code in self.scripts:
-            env = {
-                "__import__": __import__,
-                "create": CreateAPI(engine),
-                "debug": DebugAPI(engine),
-                "print": print,
-                "range": range,
-                "len": len,
-            }
-            try:
-                exec(code, env, env)
-            except Exception as e:
-                print("Script error:", e)
-
+        # a re-run script drops whatever it scheduled last time
+        engine.scheduler.clear(name)
+
+        create = CreateAPI(engine, os.path.dirname(name) if name else None)
+        env = {
+            "__import__": __import__,
+            "create": create,
+            "debug": DebugAPI(engine),
+            "input": InputAPI(engine),
+            "ray": RaycastAPI(engine),
+            "schedule": ScheduleAPI(engine, name),
+            "print": print,
+            "range": range,
+            "len": len,
+        }
+        try:
+            exec(code, env, env)
+        except Exception as e:
+            print("Script error:", e)
+        self.script_parts[name] = create.created
+        self.script_sprites[name] = create.created_sprites
+
+        # lifecycle hooks, driven by the engine's scheduler
+        if callable(env.get("on_start")):
+            engine.scheduler.call_soon(name, env["on_start"])
+        if callable(env.get("on_update")):
+            engine.scheduler.on_update(name, env["on_update"])
 
     def try_move_player(self, dx, dz):
-        test = self.player.pos.copy()
-        test.x += dx
-        if not self._collides(test):
-            self.player.pos.x = test.x
-
-        test = self.player.pos.copy()
-        test.z += dz
-        if not self._collides(test):
-            self.player.pos.z = test.z
-
-    def _collides(self, pos):
-        for part in self.parts:
-            if part.collidable and part.intersects_point(pos):
-                return True
-        return False
+        """Sweep the player's box along (dx, dz), sliding along whatever it hits."""
+        p = self.player
+        r = p.radius
+        x, y, z = p.pos.x, p.pos.y, p.pos.z
+
+        # only parts the whole move could touch
+        nearby = [
+            part.bounds() for part in self.index.query_box(
+                min(x, x + dx) - r, y, min(z, z + dz) - r,
+                max(x, x + dx) + r, y, max(z, z + dz) + r,
+            )
+            if part.collidable
+        ]
+        nearby = [b for b in nearby if b[1] <= y <= b[4]]
+        self.collision_tests += len(nearby)
+
+        # move to the first contact, then slide what's left along the face;
+        # two slides are enough to end in a corner
+        for _ in range(3):
+            if dx == 0.0 and dz == 0.0:
+                break
+            t, axis, face = _sweep(x, z, dx, dz, r, nearby)
+            if axis is None:
+                x += dx
+                z += dz
+                break
+            if axis == 0:
+                x, z = face, z + dz * t
+                dx, dz = 0.0, dz * (1.0 - t)
+            else:
+                x, z = x + dx * t, face
+                dx, dz = dx * (1.0 - t), 0.0
+
+        p.pos.x = x
+        p.pos.z = z
+
+
+# -------------------------
+# COLLISION HELPERS
+# -------------------------
+def _sweep(x, z, dx, dz, r, boxes):
+    """First contact of a box of half width r at (x, z) moving by (dx, dz).
+
+    Returns (t, axis, face): the fraction of the move made before touching,
+    the axis of the face hit (0 = x, 2 = z, None for no hit) and that
+    face's coordinate for the box's centre. Boxes the player already
+    overlaps are ignored so a player spawned inside a part can walk out.
+    """
+    best_t = 1.0
+    best_axis = best_face = None
+    for box in boxes:
+        # the box grown by r, against the centre's path; touching on an
+        # axis the move doesn't cross isn't a hit, so the player slides
+        x0, x1 = box[0] - r, box[3] + r
+        z0, z1 = box[2] - r, box[5] + r
+
+        if dx > 0.0:
+            tx0, tx1, fx = (x0 - x) / dx, (x1 - x) / dx, x0
+        elif dx < 0.0:
+            tx0, tx1, fx = (x1 - x) / dx, (x0 - x) / dx, x1
+        elif x0 < x < x1:
+            tx0, tx1, fx = -math.inf, math.inf, None
+        else:
+            continue
+
+        if dz > 0.0:
+            tz0, tz1, fz = (z0 - z) / dz, (z1 - z) / dz, z0
+        elif dz < 0.0:
+            tz0, tz1, fz = (z1 - z) / dz, (z0 - z) / dz, z1
+        elif z0 < z < z1:
+            tz0, tz1, fz = -math.inf, math.inf, None
+        else:
+            continue
+
+        if tx0 >= tz0:
+            t, axis, face = tx0, 0, fx
+        else:
+            t, axis, face = tz0, 2, fz
+        if t < -1e-9 or t > best_t or t >= min(tx1, tz1):
+            continue
+
+        best_t = t if t > 0.0 else 0.0
+        best_axis, best_face = axis, face
+
+    return best_t, best_axis, best_face
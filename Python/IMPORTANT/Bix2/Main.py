@@ -1,7 +1,13 @@
+import argparse
+
 from Engine.engine import Engine
 
 def main():
-    engine = Engine()
+    parser = argparse.ArgumentParser(description="Run Bix2.")
+    parser.add_argument("--record", metavar="FILE", help="record every tick's input to FILE (replay with bench.py --replay)")
+    args = parser.parse_args()
+
+    engine = Engine(record=args.record)
     engine.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+import argparse
+import random
+import statistics
+import time
+from collections import deque
+
+from Engine.engine import Engine
+from Engine.math3d import Vec3
+from Engine.raycast import stats
+from Engine.sprite import Sprite
+
+
+# -------------------------
+# FRAME BENCHMARK
+# python bench.py [Workspace] --frames 300 --mode numpy
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Render frames of a Workspace headlessly and report timings.")
+    parser.add_argument("workspace", nargs="?", help="Workspace folder (default: ./Workspace)")
+    parser.add_argument("--scripts", help="ScriptService folder (default: ./ScriptService)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--mode", choices=("numpy", "lines"), help="renderer mode (default: best available)")
+    parser.add_argument("--workers", type=int, default=1, help="render threads (numpy mode)")
+    parser.add_argument("--scale", type=float, default=1.0, help="render scale, fraction of columns cast")
+    parser.add_argument("--target-ms", type=float, help="let the renderer adapt its scale to this frame time")
+    parser.add_argument("--forward", type=float, default=0.0, help="forward input held every frame")
+    parser.add_argument("--turn", type=float, default=1.0, help="turn input held every frame")
+    parser.add_argument("--profile", help="write per-frame profiler rows to this .csv or .json")
+    parser.add_argument("--replay", help="play back a recorded session (Main.py --record) instead of --forward/--turn")
+    parser.add_argument("--sprites", type=int, default=0, help="scatter this many sprites around the player")
+    args = parser.parse_args()
+
+    if args.replay:
+        engine = Engine(args.workspace, args.scripts, headless=True, replay=args.replay)
+        args.frames = len(engine.input)
+    else:
+        inputs = [(args.forward, args.turn)] * args.frames
+        engine = Engine(args.workspace, args.scripts, headless=True, inputs=inputs)
+
+    renderer = engine.renderer
+    if args.mode:
+        renderer.mode = args.mode
+    renderer.workers = args.workers
+    renderer.render_scale = args.scale
+    renderer.target_ms = args.target_ms
+
+    # same seed every run, so sprite workloads are repeatable
+    rng = random.Random(0)
+    p = engine.world.player.pos
+    engine.world.add_sprites([
+        Sprite(Vec3(p.x + rng.uniform(-12, 12), p.y, p.z + rng.uniform(-12, 12)),
+               (0.6, 1.0), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        for _ in range(args.sprites)
+    ])
+    if args.profile:
+        engine.profiler.frames = deque(maxlen=args.frames)
+        engine.profiler.start()
+
+    engine.running = True
+    stats.reset()
+
+    frame_ms = []
+    phase_ms = dict.fromkeys(["input", "update", "scripts", "render"], 0.0)
+    scales = []
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        # exactly one tick per frame so every run walks the same camera path
+        engine.step(1 / engine.tick_rate)
+        if not engine.running:
+            break
+        frame_ms.append((time.perf_counter() - t0) * 1000)
+        for phase in phase_ms:
+            phase_ms[phase] += engine.timings[phase]
+        scales.append(engine.timings["render_scale"])
+    total = time.perf_counter() - start
+
+    if not frame_ms:
+        print("no frames rendered")
+        return
+
+    print(f"parts:      {len(engine.world.parts)}")
+    print(f"sprites:    {len(engine.world.sprites)}")
+    print(f"mode:       {renderer.mode} x{renderer.workers}")
+    print(f"frames:     {len(frame_ms)}")
+    print(f"ms/frame:   mean {statistics.mean(frame_ms):.2f}  "
+          f"median {statistics.median(frame_ms):.2f}  worst {max(frame_ms):.2f}")
+    print("phases:     " + "  ".join(
+        f"{phase} {ms / len(frame_ms):.2f}" for phase, ms in phase_ms.items()))
+    print(f"scale:      mean {statistics.mean(scales):.2f}  final {scales[-1]:.2f}")
+    p = engine.world.player
+    print(f"player:     pos ({p.pos.x:.6f}, {p.pos.y:.6f}, {p.pos.z:.6f})  yaw {p.yaw:.6f}")
+    print(f"rays/sec:   {stats.rays / total:,.0f}")
+    print(f"steps/ray:  {stats.steps / max(stats.rays, 1):.1f}")
+    print(f"tests/ray:  {stats.tests / max(stats.rays, 1):.1f}")
+
+    if args.profile:
+        engine.profiler.dump(args.profile)
+        print(f"profile:    {args.profile}")
+
+
+if __name__ == "__main__":
+    main()
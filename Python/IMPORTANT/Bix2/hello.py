@@ -69,3 +69,8 @@ maze = generate_maze(maze_width, maze_height)
 create_maze_parts(maze)
 
 print(f"Maze generated with {maze_width*maze_height} cells and parts created in {workspace_path}")
+
+# Pack the folder so the engine loads one file instead of one per wall
+from Engine.loader import pack_workspace
+pack_path, pack_count = pack_workspace(workspace_path)
+print(f"Packed {pack_count} parts into {pack_path}")
@@ -0,0 +1,26 @@
+import argparse
+
+from Engine.loader import pack_chunks, pack_workspace
+
+
+# -------------------------
+# WORKSPACE PACKER
+# python pack.py [Workspace] [--chunks 32]
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Pack a Workspace's .part files into one file or streamed chunks.")
+    parser.add_argument("workspace", nargs="?", default="Workspace")
+    parser.add_argument("--chunks", type=float, metavar="SIZE",
+                        help="split into SIZE x SIZE chunks streamed around the player")
+    args = parser.parse_args()
+
+    if args.chunks:
+        out, count, chunks = pack_chunks(args.workspace, args.chunks)
+        print(f"Packed {count} parts into {chunks} chunks in {out}")
+    else:
+        out, count = pack_workspace(args.workspace)
+        print(f"Packed {count} parts into {out}")
+
+
+if __name__ == "__main__":
+    main()